@@ -1,32 +1,158 @@
-def bfs(graph, start):
-    visited = set()
-    queue = [start]
-    ordre = []
+from array import array
+from collections import deque
+from algo.graph import CSRGraph
+
+def bfs_tree(graph, sources, target=None, sort=False):
+    """Parcours en largeur multi-sources en O(V + E).
+
+    Renvoie (dist, parent) pour les sommets atteints : dist[u] est le niveau
+    de u (nombre d'arcs depuis la source la plus proche) et parent[u] son
+    prédécesseur dans l'arbre BFS. Le parcours s'arrête dès que `target`
+    est atteint.
+    """
+    if isinstance(graph, CSRGraph) and not sort:
+        return _bfs_tree_csr(graph, sources, target)
+    dist = {}
+    parent = {}
+    queue = deque()
+    for s in sources:
+        if s not in dist:
+            dist[s] = 0
+            parent[s] = None
+            queue.append(s)
+    if target in dist:
+        return dist, parent
     while queue:
-        u = queue.pop(0)
-        if u not in visited:
-            visited.add(u)
-            ordre.append(u)
-            print(u, end=" ")
-            for voisin in sorted(graph[u]):
-                if voisin not in visited:
-                    queue.append(voisin)
-    return ordre
-
-def connected_components(graph):
+        u = queue.popleft()
+        d = dist[u] + 1
+        for v in (sorted(graph[u]) if sort else graph[u]):
+            if v not in dist:
+                dist[v] = d
+                parent[v] = u
+                if v == target:
+                    return dist, parent
+                queue.append(v)
+    return dist, parent
+
+def _bfs_tree_csr(graph, sources, target):
+    n = graph.num_nodes
+    offsets, targets, labels = graph.offsets, graph.targets, graph.labels
+    seen = bytearray(n)
+    level = array("q", [0]) * n
+    pred = array("q", [-1]) * n
+    order = []
+    for s in sources:
+        i = graph.index[s]
+        if not seen[i]:
+            seen[i] = 1
+            order.append(i)
+    t = graph.index[target] if target is not None else -1
+    head = 0
+    while head < len(order) and not (t >= 0 and seen[t]):
+        u = order[head]
+        head += 1
+        d = level[u] + 1
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if not seen[v]:
+                seen[v] = 1
+                level[v] = d
+                pred[v] = u
+                order.append(v)
+                if v == t:
+                    break
+    dist = {labels[u]: level[u] for u in order}
+    parent = {labels[u]: labels[pred[u]] if pred[u] >= 0 else None for u in order}
+    return dist, parent
+
+def bfs(graph, start, sort=False):
+    dist, _ = bfs_tree(graph, [start], sort=sort)
+    return list(dist)
+
+def bfs_path(parent, target):
+    path = []
+    u = target
+    while u is not None:
+        path.append(u)
+        u = parent[u]
+    return list(reversed(path))
+
+def shortest_hop_path(graph, source, target, reverse=None):
+    """Plus court chemin (en nombre d'arcs) par BFS bidirectionnelle.
+
+    `reverse` est le graphe transposé ; s'il est omis, le graphe est supposé
+    non orienté. Renvoie la liste des sommets du chemin, ou None.
+    """
+    if reverse is None:
+        reverse = graph
+    if source == target:
+        return [source]
+    parents = ({source: None}, {target: None})
+    depths = ({source: 0}, {target: 0})
+    frontiers = ([source], [target])
+    adjacency = (graph, reverse)
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, depth, other = parents[side], depths[side], depths[1 - side]
+        best = None
+        next_frontier = []
+        for u in frontiers[side]:
+            d = depth[u] + 1
+            for v in adjacency[side][u]:
+                if v in mine:
+                    continue
+                mine[v] = u
+                depth[v] = d
+                next_frontier.append(v)
+                if v in other and (best is None or other[v] < other[best]):
+                    best = v
+        if best is not None:
+            forward = bfs_path(parents[0], best)
+            backward = bfs_path(parents[1], best)
+            return forward + backward[::-1][1:]
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    return None
+
+def connected_components(graph, sort=False):
+    """Composantes (parcours en largeur depuis chaque sommet non visité).
+
+    Les racines sont prises dans l'ordre de graph.keys() ; `sort=True` les
+    prend dans l'ordre trié et visite les voisins triés (ordre déterministe).
+    """
+    if isinstance(graph, CSRGraph) and not sort:
+        return _connected_components_csr(graph)
     visited = set()
     components = []
-    for node in sorted(graph.keys()):
+    for node in (sorted(graph.keys()) if sort else graph.keys()):
         if node not in visited:
-            comp = []
-            queue = [node]
+            visited.add(node)
+            comp = [node]
+            queue = deque(comp)
             while queue:
-                u = queue.pop(0)
-                if u not in visited:
-                    visited.add(u)
-                    comp.append(u)
-                    for v in graph[u]:
-                        if v not in visited:
-                            queue.append(v)
+                u = queue.popleft()
+                for v in (sorted(graph[u]) if sort else graph[u]):
+                    if v not in visited:
+                        visited.add(v)
+                        comp.append(v)
+                        queue.append(v)
             components.append(comp)
     return components
+
+def _connected_components_csr(graph):
+    offsets, targets, labels = graph.offsets, graph.targets, graph.labels
+    seen = bytearray(graph.num_nodes)
+    components = []
+    for root in range(graph.num_nodes):
+        if seen[root]:
+            continue
+        seen[root] = 1
+        order = [root]
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if not seen[v]:
+                    seen[v] = 1
+                    order.append(v)
+        components.append([labels[u] for u in order])
+    return components
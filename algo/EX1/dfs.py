@@ -1,26 +1,221 @@
-def dfs(graph, start, visited=None):
+from array import array
+from algo.graph import CSRGraph
+
+def _neighbours(graph, u, sort):
+    return sorted(graph[u]) if sort else graph[u]
+
+def dfs_events(graph, start, visited=None, sort=False):
+    """Parcours en profondeur itératif (pile explicite, pas de récursion).
+
+    Produit (True, u) à la découverte de u et (False, u) quand u est terminé.
+    `sort=True` visite les voisins dans l'ordre trié (ordre déterministe).
+    """
     if visited is None:
         visited = set()
+    if isinstance(graph, CSRGraph) and not sort:
+        labels = graph.labels
+        seen = bytearray(graph.num_nodes)
+        for x in visited:
+            if x in graph.index:
+                seen[graph.index[x]] = 1
+        for discovered, u in _csr_events(graph, graph.index[start], seen, array("q", graph.offsets)):
+            if discovered:
+                visited.add(labels[u])
+            yield discovered, labels[u]
+        return
     visited.add(start)
-    print(start, end=" ")
-    for voisin in sorted(graph[start]):
-        if voisin not in visited:
-            dfs(graph, voisin, visited)
+    yield True, start
+    stack = [(start, iter(_neighbours(graph, start, sort)))]
+    while stack:
+        u, it = stack[-1]
+        for v in it:
+            if v not in visited:
+                visited.add(v)
+                yield True, v
+                stack.append((v, iter(_neighbours(graph, v, sort))))
+                break
+        else:
+            stack.pop()
+            yield False, u
+
+def _csr_events(graph, root, seen, pos):
+    # même parcours sur les indices entiers : pos[u] est le prochain arc à
+    # examiner depuis u, seen est partagé entre les racines
+    offsets, targets = graph.offsets, graph.targets
+    seen[root] = 1
+    yield True, root
+    stack = [root]
+    while stack:
+        u = stack[-1]
+        p, end = pos[u], offsets[u + 1]
+        while p < end and seen[targets[p]]:
+            p += 1
+        if p < end:
+            v = targets[p]
+            pos[u] = p + 1
+            seen[v] = 1
+            yield True, v
+            stack.append(v)
+        else:
+            pos[u] = end
+            stack.pop()
+            yield False, u
+
+def dfs_preorder(graph, start, visited=None, sort=False):
+    for discovered, u in dfs_events(graph, start, visited, sort):
+        if discovered:
+            yield u
+
+def dfs_postorder(graph, start, visited=None, sort=False):
+    for discovered, u in dfs_events(graph, start, visited, sort):
+        if not discovered:
+            yield u
+
+def dfs(graph, start, visited=None, sort=False):
+    if visited is None:
+        visited = set()
+    for _ in dfs_events(graph, start, visited, sort):
+        pass
     return visited
 
-def has_cycle(graph):
+def dfs_timestamps(graph, sort=False):
+    discovery = {}
+    finish = {}
+    clock = 0
+    if isinstance(graph, CSRGraph) and not sort:
+        labels = graph.labels
+        seen = bytearray(graph.num_nodes)
+        pos = array("q", graph.offsets)
+        for root in range(graph.num_nodes):
+            if seen[root]:
+                continue
+            for discovered, u in _csr_events(graph, root, seen, pos):
+                (discovery if discovered else finish)[labels[u]] = clock
+                clock += 1
+        return discovery, finish
     visited = set()
-    def _dfs(u, parent):
-        visited.add(u)
-        for v in graph[u]:
-            if v not in visited:
-                if _dfs(v, u):
+    roots = sorted(graph.keys()) if sort else graph.keys()
+    for root in roots:
+        if root in visited:
+            continue
+        for discovered, u in dfs_events(graph, root, visited, sort):
+            if discovered:
+                discovery[u] = clock
+            else:
+                finish[u] = clock
+            clock += 1
+    return discovery, finish
+
+def has_cycle(graph, directed=True):
+    if isinstance(graph, CSRGraph):
+        return _has_directed_cycle_csr(graph) if directed else _has_undirected_cycle_csr(graph)
+    if directed:
+        return _has_directed_cycle(graph)
+    return _has_undirected_cycle(graph)
+
+def _has_directed_cycle_csr(graph):
+    offsets, targets = graph.offsets, graph.targets
+    n = graph.num_nodes
+    state = bytearray(n)
+    pos = array("q", offsets)
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [root]
+        while stack:
+            u = stack[-1]
+            p, end = pos[u], offsets[u + 1]
+            found = -1
+            while p < end:
+                v = targets[p]
+                p += 1
+                s = state[v]
+                if s == 1:
+                    return True
+                if s == 0:
+                    found = v
+                    break
+            pos[u] = p
+            if found >= 0:
+                state[found] = 1
+                stack.append(found)
+            else:
+                state[u] = 2
+                stack.pop()
+    return False
+
+def _has_undirected_cycle_csr(graph):
+    offsets, targets = graph.offsets, graph.targets
+    n = graph.num_nodes
+    seen = bytearray(n)
+    parent = array("q", [-1]) * n
+    pos = array("q", offsets)
+    for root in range(n):
+        if seen[root]:
+            continue
+        seen[root] = 1
+        stack = [root]
+        while stack:
+            u = stack[-1]
+            p, end = pos[u], offsets[u + 1]
+            found = -1
+            while p < end:
+                v = targets[p]
+                p += 1
+                if not seen[v]:
+                    found = v
+                    break
+                if v != parent[u]:
+                    return True
+            pos[u] = p
+            if found >= 0:
+                seen[found] = 1
+                parent[found] = u
+                stack.append(found)
+            else:
+                stack.pop()
+    return False
+
+def _has_directed_cycle(graph):
+    # 1 = sur la pile courante (gris), 2 = terminé (noir)
+    state = {}
+    for root in graph.keys():
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(graph[root]))]
+        while stack:
+            u, it = stack[-1]
+            for v in it:
+                s = state.get(v)
+                if s == 1:
+                    return True
+                if s is None:
+                    state[v] = 1
+                    stack.append((v, iter(graph[v])))
+                    break
+            else:
+                state[u] = 2
+                stack.pop()
+    return False
+
+def _has_undirected_cycle(graph):
+    visited = set()
+    for root in graph.keys():
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, None, iter(graph[root]))]
+        while stack:
+            u, parent, it = stack[-1]
+            for v in it:
+                if v not in visited:
+                    visited.add(v)
+                    stack.append((v, u, iter(graph[v])))
+                    break
+                if v != parent:
                     return True
-            elif v != parent:
-                return True
-        return False
-    for node in sorted(graph.keys()):
-        if node not in visited:
-            if _dfs(node, None):
-                return True
+            else:
+                stack.pop()
     return False
@@ -0,0 +1,108 @@
+from array import array
+from algo.graph import CSRGraph
+
+class DisjointSet:
+    """Composantes connexes incrémentales (union-find).
+
+    Stockage par tableaux (parent, rang, taille) indexés par identifiant
+    entier ; union par rang et compression de chemin, donc chaque opération
+    coûte O(α(n)) amorti. Les sommets inconnus sont ajoutés à la volée.
+    Les arcs sont traités sans orientation : pour un graphe orienté, on
+    obtient les composantes faiblement connexes.
+    """
+
+    __slots__ = ("index", "labels", "parent", "rank", "size", "count")
+
+    def __init__(self, items=()):
+        self.index = {}
+        self.labels = []
+        self.parent = array("q")
+        self.rank = bytearray()
+        self.size = array("q")
+        self.count = 0
+        for x in items:
+            self.add(x)
+
+    @classmethod
+    def from_graph(cls, graph):
+        if isinstance(graph, CSRGraph):
+            # les indices du CSR sont ceux de l'ensemble (même ordre d'ajout)
+            ds = cls(graph.labels)
+            offsets, targets = graph.offsets, graph.targets
+            for u in range(graph.num_nodes):
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    ds._union(u, v)
+            return ds
+        ds = cls(graph.keys())
+        for u in graph.keys():
+            for v in graph[u]:
+                ds.union(u, v[0] if isinstance(v, tuple) else v)
+        return ds
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, x):
+        return x in self.index
+
+    def add(self, x):
+        i = self.index.get(x)
+        if i is None:
+            i = len(self.labels)
+            self.index[x] = i
+            self.labels.append(x)
+            self.parent.append(i)
+            self.rank.append(0)
+            self.size.append(1)
+            self.count += 1
+        return i
+
+    def _find(self, i):
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def find(self, x):
+        return self.labels[self._find(self.index[x])]
+
+    def union(self, u, v):
+        return self._union(self.add(u), self.add(v))
+
+    def _union(self, i, j):
+        a = self._find(i)
+        b = self._find(j)
+        if a == b:
+            return False
+        rank = self.rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        self.count -= 1
+        return True
+
+    def add_edges(self, edges):
+        for edge in edges:
+            self.union(edge[0], edge[1])
+
+    def same_component(self, u, v):
+        if u not in self.index or v not in self.index:
+            return u == v
+        return self._find(self.index[u]) == self._find(self.index[v])
+
+    def component_size(self, x):
+        if x not in self.index:
+            return 1
+        return self.size[self._find(self.index[x])]
+
+    def components(self):
+        groups = {}
+        for i, x in enumerate(self.labels):
+            groups.setdefault(self._find(i), []).append(x)
+        return list(groups.values())
@@ -0,0 +1,169 @@
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from algo.graph import CSRGraph
+
+INF = float("inf")
+
+# tableaux partagés attachés dans chaque processus de travail
+_worker = {}
+
+
+def _share(buf, blocks):
+    data = memoryview(buf).cast("B")
+    # au moins un élément de 8 octets : un segment vide ne peut pas être créé
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 8))
+    shm.buf[:len(data)] = data
+    blocks.append(shm)
+    return shm.name, buf.typecode if isinstance(buf, array) else buf.format, len(buf)
+
+
+def _attach(spec):
+    name, typecode, count = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, shm.buf.cast(typecode)[:count]
+
+
+def _init_worker(specs, n, method):
+    _release_worker()
+    _worker["n"] = n
+    _worker["method"] = method
+    for key, spec in specs.items():
+        shm, view = _attach(spec)
+        _worker[key + "_shm"] = shm
+        _worker[key] = view
+
+
+def _release_worker():
+    # les vues doivent être libérées avant de fermer les segments
+    for value in _worker.values():
+        if isinstance(value, memoryview):
+            value.release()
+    for value in _worker.values():
+        if isinstance(value, shared_memory.SharedMemory):
+            value.close()
+    _worker.clear()
+
+
+def _dijkstra_row(s, n, offsets, targets, weights, cols, out, base):
+    dist = [INF] * n
+    dist[s] = 0
+    pq = [(0, s)]
+    while pq:
+        d_u, u = heapq.heappop(pq)
+        if d_u > dist[u]:
+            continue
+        for pos in range(offsets[u], offsets[u + 1]):
+            v = targets[pos]
+            d_v = d_u + weights[pos]
+            if d_v < dist[v]:
+                dist[v] = d_v
+                heapq.heappush(pq, (d_v, v))
+    out[base:base + len(cols)] = array("d", map(dist.__getitem__, cols))
+    return True
+
+
+def _bellman_ford_row(s, n, offsets, targets, weights, cols, out, base):
+    dist = [INF] * n
+    dist[s] = 0
+    for _ in range(n):
+        updated = False
+        for u in range(n):
+            d_u = dist[u]
+            if d_u == INF:
+                continue
+            for pos in range(offsets[u], offsets[u + 1]):
+                v = targets[pos]
+                if d_u + weights[pos] < dist[v]:
+                    dist[v] = d_u + weights[pos]
+                    updated = True
+        if not updated:
+            out[base:base + len(cols)] = array("d", map(dist.__getitem__, cols))
+            return True
+    return False
+
+
+_ROW_SOLVERS = {"dijkstra": _dijkstra_row, "bellman_ford": _bellman_ford_row}
+
+
+def _solve_rows(rows):
+    w = _worker
+    solve = _ROW_SOLVERS[w["method"]]
+    n = w["n"]
+    cols = w["cols"]
+    failed = []
+    for row, s in rows:
+        if not solve(s, n, w["offsets"], w["targets"], w["weights"], cols, w["out"], row * len(cols)):
+            failed.append(s)
+    return failed
+
+
+def all_pairs(graph, sources=None, targets=None, method="dijkstra", workers=None):
+    """Matrice des distances de plusieurs sources vers plusieurs cibles.
+
+    Les sources sont réparties entre `workers` processus ; le graphe (au
+    format CSR) et la matrice résultat sont placés en mémoire partagée, donc
+    rien n'est sérialisé par tâche. Chaque ligne n'y écrit que les colonnes
+    des cibles : la matrice partagée a len(sources) x len(targets) cases.
+    Renvoie un tableau NumPy de forme
+    (len(sources), len(targets)) si NumPy est disponible, sinon une liste
+    de lignes array('d'). Lève ValueError si `method="bellman_ford"`
+    rencontre un cycle de poids négatif.
+    """
+    if method not in _ROW_SOLVERS:
+        raise ValueError(f"méthode inconnue : {method}")
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    labels = graph.labels
+    n = graph.num_nodes
+    sources = list(labels) if sources is None else list(sources)
+    targets = list(labels) if targets is None else list(targets)
+    src_ids = [graph.index[s] for s in sources]
+    tgt_ids = [graph.index[t] for t in targets]
+    weights = graph.weights if graph.weights is not None else array("q", [1]) * graph.num_edges
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(src_ids)) or 1
+
+    blocks = []
+    try:
+        specs = {
+            "offsets": _share(graph.offsets, blocks),
+            "targets": _share(graph.targets, blocks),
+            "weights": _share(weights, blocks),
+            "cols": _share(array("q", tgt_ids), blocks),
+            "out": _share(array("d", [INF]) * (len(src_ids) * len(tgt_ids)), blocks),
+        }
+        rows = list(enumerate(src_ids))
+        if workers == 1:
+            _init_worker(specs, n, method)
+            failed = _solve_rows(rows)
+        else:
+            chunk = max(1, len(rows) // (workers * 4))
+            batches = [rows[i:i + chunk] for i in range(0, len(rows), chunk)]
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(specs, n, method)) as pool:
+                failed = [s for part in pool.map(_solve_rows, batches) for s in part]
+        if failed:
+            raise ValueError(f"cycle de poids négatif atteignable depuis {labels[failed[0]]}")
+        k = len(tgt_ids)
+        out = blocks[-1].buf.cast("d")
+        try:
+            if np is not None:
+                full = np.frombuffer(out, dtype=np.float64, count=len(src_ids) * k).reshape(len(src_ids), k)
+                return full.copy()
+            return [array("d", out[r * k:(r + 1) * k]) for r in range(len(src_ids))]
+        finally:
+            full = None
+            out.release()
+    finally:
+        _release_worker()
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
@@ -1,6 +1,10 @@
 import heapq
+from collections import OrderedDict
+from algo.graph import CSRGraph
 
 def dijkstra(graph, source):
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_csr(graph, source)
     dist = {node: float("inf") for node in graph}
     dist[source] = 0
     parent = {node: None for node in graph}
@@ -18,6 +22,37 @@ def dijkstra(graph, source):
                 heapq.heappush(pq, (dist[v], v))
     return dist, parent
 
+def _dijkstra_csr(graph, source):
+    n = graph.num_nodes
+    offsets, targets, labels = graph.offsets, graph.targets, graph.labels
+    weights = graph.weights
+    dist = [float("inf")] * n
+    parent = [-1] * n
+    done = bytearray(n)
+    s = graph.index[source]
+    dist[s] = 0
+    pq = [(0, s)]
+    while pq:
+        d_u, u = heapq.heappop(pq)
+        if done[u]:
+            continue
+        done[u] = 1
+        lo, hi = offsets[u], offsets[u + 1]
+        if weights is None:
+            edges = zip(targets[lo:hi], [1] * (hi - lo))
+        else:
+            edges = zip(targets[lo:hi], weights[lo:hi])
+        for v, w_uv in edges:
+            d_v = d_u + w_uv
+            if d_v < dist[v]:
+                dist[v] = d_v
+                parent[v] = u
+                heapq.heappush(pq, (d_v, v))
+    return (
+        {labels[i]: dist[i] for i in range(n)},
+        {labels[i]: labels[parent[i]] if parent[i] >= 0 else None for i in range(n)},
+    )
+
 def reconstruct_path(parent, target):
     path = []
     u = target
@@ -25,3 +60,109 @@ def reconstruct_path(parent, target):
         path.append(u)
         u = parent[u]
     return list(reversed(path))
+
+class DijkstraService:
+    """Requêtes de plus courts chemins répétées sur un même graphe.
+
+    Le graphe est converti une fois en listes d'adjacence sur des entiers ;
+    les tableaux de distances et de parents sont réutilisés d'une requête à
+    l'autre (un compteur d'époque évite de les réinitialiser). Les arbres
+    complets calculés depuis une source sont gardés dans un cache LRU,
+    vidé par set_graph.
+    """
+
+    def __init__(self, graph, cache_size=64):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.set_graph(graph)
+
+    def set_graph(self, graph):
+        self.graph = graph
+        self._cache.clear()
+        self.labels = list(graph.keys())
+        self.index = {u: i for i, u in enumerate(self.labels)}
+        index = self.index
+        if isinstance(graph, CSRGraph):
+            offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+            if weights is None:
+                # graphe non pondéré : chaque arête compte pour 1
+                self._adj = [
+                    [(v, 1) for v in targets[offsets[u]:offsets[u + 1]]]
+                    for u in range(graph.num_nodes)
+                ]
+            else:
+                self._adj = [
+                    list(zip(targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]]))
+                    for u in range(graph.num_nodes)
+                ]
+        else:
+            self._adj = [[(index[v], w) for v, w in graph[u]] for u in self.labels]
+        n = len(self.labels)
+        self._dist = [0] * n
+        self._parent = [-1] * n
+        self._stamp = [0] * n
+        self._epoch = 0
+
+    def _run(self, s, t=-1, heuristic=None):
+        # renvoie (t atteint ?, nœuds fixés dans l'ordre)
+        self._epoch += 1
+        epoch, stamp, dist, parent, adj = self._epoch, self._stamp, self._dist, self._parent, self._adj
+        stamp[s] = epoch
+        dist[s] = 0
+        parent[s] = -1
+        pq = [(0, 0, s)]
+        settled = []
+        while pq:
+            _, d_u, u = heapq.heappop(pq)
+            if d_u > dist[u]:
+                continue
+            if u == t:
+                return True, settled
+            settled.append(u)
+            for v, w_uv in adj[u]:
+                d_v = d_u + w_uv
+                if stamp[v] != epoch or d_v < dist[v]:
+                    stamp[v] = epoch
+                    dist[v] = d_v
+                    parent[v] = u
+                    prio = d_v + heuristic(self.labels[v]) if heuristic else d_v
+                    heapq.heappush(pq, (prio, d_v, v))
+        return False, settled
+
+    def tree(self, source):
+        if source in self._cache:
+            self._cache.move_to_end(source)
+            return self._cache[source]
+        _, settled = self._run(self.index[source])
+        labels, dist, parent = self.labels, self._dist, self._parent
+        result = (
+            {labels[u]: dist[u] for u in settled},
+            {labels[u]: labels[parent[u]] if parent[u] >= 0 else None for u in settled},
+        )
+        self._cache[source] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def shortest_path(self, source, target, heuristic=None):
+        """Renvoie (distance, chemin) de source à target, ou (inf, None).
+
+        Le calcul s'arrête dès que target est fixé. `heuristic(u)` est une
+        borne inférieure admissible de la distance de u à target (A*).
+        """
+        if source in self._cache:
+            self._cache.move_to_end(source)
+            dist, parent = self._cache[source]
+            if target not in dist:
+                return float("inf"), None
+            return dist[target], reconstruct_path(parent, target)
+        t = self.index[target]
+        reached, _ = self._run(self.index[source], t, heuristic)
+        if not reached:
+            return float("inf"), None
+        path = []
+        u = t
+        while u >= 0:
+            path.append(self.labels[u])
+            u = self._parent[u]
+        return self._dist[t], list(reversed(path))
@@ -1,4 +1,28 @@
-def bellman_ford(nodes, edge_list, source):
+from collections import deque
+from algo.graph import CSRGraph
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _edge_input(nodes, edge_list, source, edges=True):
+    # deux formes d'appel : (nodes, edge_list, source) ou (graphe CSR, source=...)
+    if isinstance(nodes, CSRGraph):
+        if edge_list is not None:
+            raise TypeError("avec un CSRGraph, la source se passe par source=...")
+        edge_list = nodes.edge_list() if edges else None
+        nodes = nodes.labels
+    elif edge_list is None:
+        raise TypeError("edge_list manquant")
+    if source is None:
+        raise TypeError("source manquante")
+    return nodes, edge_list, source
+
+def bellman_ford(nodes, edge_list=None, source=None):
+    """Bellman-Ford sur (nodes, edge_list) ou sur un CSRGraph
+    (bellman_ford(graphe, source=s)). Renvoie (dist, parent, cycle négatif ?)."""
+    nodes, edge_list, source = _edge_input(nodes, edge_list, source)
     dist = {u: float("inf") for u in nodes}
     dist[source] = 0
     parent = {u: None for u in nodes}
@@ -17,6 +41,105 @@ def bellman_ford(nodes, edge_list, source):
             return None, None, True
     return dist, parent, False
 
+def bellman_ford_queue(nodes, edge_list=None, source=None):
+    """Variante à file (SPFA) : seuls les arcs sortant des sommets dont la
+    distance vient de baisser sont relâchés.
+
+    Renvoie (dist, parent, None), ou (None, None, cycle) où cycle est la
+    liste des sommets d'un cycle de poids négatif atteignable depuis source.
+    """
+    nodes, edge_list, source = _edge_input(nodes, edge_list, source)
+    out = {u: [] for u in nodes}
+    for u, v, w_uv in edge_list:
+        out[u].append((v, w_uv))
+    n = len(nodes)
+    dist = {u: float("inf") for u in nodes}
+    parent = {u: None for u in nodes}
+    # nombre d'arcs du chemin courant : atteindre n prouve un cycle négatif
+    length = {source: 0}
+    dist[source] = 0
+    queue = deque([source])
+    in_queue = {source}
+    while queue:
+        u = queue.popleft()
+        in_queue.discard(u)
+        d_u = dist[u]
+        for v, w_uv in out[u]:
+            if d_u + w_uv < dist[v]:
+                dist[v] = d_u + w_uv
+                parent[v] = u
+                length[v] = length[u] + 1
+                if length[v] >= n:
+                    return None, None, find_negative_cycle(parent, v)
+                if v not in in_queue:
+                    in_queue.add(v)
+                    queue.append(v)
+    return dist, parent, None
+
+def bellman_ford_vectorized(nodes, edge_list=None, source=None):
+    """Bellman-Ford par passes vectorisées NumPy sur les tableaux d'arcs.
+
+    Même résultat que bellman_ford_queue ; nécessite NumPy.
+    """
+    if np is None:
+        raise ImportError("bellman_ford_vectorized nécessite numpy")
+    graph = nodes if isinstance(nodes, CSRGraph) else None
+    nodes, edge_list, source = _edge_input(nodes, edge_list, source, edges=False)
+    nodes = list(nodes)
+    index = {u: i for i, u in enumerate(nodes)}
+    n = len(nodes)
+    if graph is not None:
+        # tableaux d'arcs lus directement dans le CSR
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(graph.offsets)))
+        dst = np.asarray(graph.targets, dtype=np.int64)
+        if graph.weights is not None:
+            w = np.asarray(graph.weights, dtype=np.float64)
+        else:
+            w = np.ones(len(dst))
+    else:
+        src = np.fromiter((index[e[0]] for e in edge_list), dtype=np.int64, count=len(edge_list))
+        dst = np.fromiter((index[e[1]] for e in edge_list), dtype=np.int64, count=len(edge_list))
+        w = np.fromiter((e[2] for e in edge_list), dtype=np.float64, count=len(edge_list))
+    dist = np.full(n, np.inf)
+    dist[index[source]] = 0
+    parent = np.full(n, -1, dtype=np.int64)
+    for _ in range(n):
+        cand = dist[src] + w
+        new = dist.copy()
+        np.minimum.at(new, dst, cand)
+        improved = cand < dist[dst]
+        if not improved.any():
+            break
+        best = improved & (cand == new[dst])
+        parent[dst[best]] = src[best]
+        dist = new
+    else:
+        v = int(dst[improved][0])
+        parent_map = {nodes[i]: nodes[p] if p >= 0 else None for i, p in enumerate(parent.tolist())}
+        cycle = find_negative_cycle(parent_map, nodes[v])
+        if cycle is None:
+            if graph is not None:
+                return bellman_ford_queue(graph, source=source)
+            return bellman_ford_queue(nodes, edge_list, source)
+        return None, None, cycle
+    dist_map = dict(zip(nodes, dist.tolist()))
+    parent_map = {nodes[i]: nodes[p] if p >= 0 else None for i, p in enumerate(parent.tolist())}
+    return dist_map, parent_map, None
+
+def find_negative_cycle(parent, v):
+    """Remonte les parents depuis v (relâché après n passes) jusqu'au cycle."""
+    for _ in range(len(parent)):
+        v = parent[v]
+        if v is None:
+            return None
+    cycle = [v]
+    u = parent[v]
+    while u != v:
+        cycle.append(u)
+        u = parent[u]
+    cycle.reverse()
+    return cycle
+
 def reconstruct_path(parent, target):
     path = []
     u = target
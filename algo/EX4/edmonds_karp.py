@@ -1,7 +1,13 @@
 from collections import deque
+from algo.graph import CSRGraph
+from algo.EX4.ford_fulkerson import residual_rows
 
 def edmonds_karp(capacity_matrix, source, sink):
-    n = len(capacity_matrix)
+    if isinstance(capacity_matrix, CSRGraph):
+        source = capacity_matrix.index[source]
+        sink = capacity_matrix.index[sink]
+    residual = residual_rows(capacity_matrix)
+    n = len(residual)
     parent = [-1] * n
 
     def bfs(residual, s, t):
@@ -12,8 +18,8 @@ def edmonds_karp(capacity_matrix, source, sink):
         parent[:] = [-1] * n
         while queue:
             u = queue.popleft()
-            for v in range(n):
-                if not visited[v] and residual[u][v] > 0:
+            for v, c in residual[u].items():
+                if not visited[v] and c > 0:
                     queue.append(v)
                     visited[v] = True
                     parent[v] = u
@@ -21,7 +27,6 @@ def edmonds_karp(capacity_matrix, source, sink):
                         return True
         return False
 
-    residual = [row[:] for row in capacity_matrix]
     max_flow = 0
 
     while bfs(residual, source, sink):
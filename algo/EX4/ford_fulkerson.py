@@ -1,28 +1,46 @@
+from algo.graph import CSRGraph
+
+def residual_rows(graph):
+    if isinstance(graph, CSRGraph):
+        n = graph.num_nodes
+        rows = [{} for _ in range(n)]
+        for u, v, c in graph.edges():
+            rows[u][v] = rows[u].get(v, 0) + c
+    else:
+        n = len(graph)
+        rows = [{v: c for v, c in enumerate(row) if c != 0} for row in graph]
+    for u in range(n):
+        for v in list(rows[u]):
+            rows[v].setdefault(u, 0)
+    return rows
+
 def ford_fulkerson(capacity_matrix, source, sink):
-    n = len(capacity_matrix)
+    if isinstance(capacity_matrix, CSRGraph):
+        source = capacity_matrix.index[source]
+        sink = capacity_matrix.index[sink]
+    residual = residual_rows(capacity_matrix)
+    n = len(residual)
     parent = [-1] * n
 
-    def bfs(residual, s, t):
+    def dfs(residual, s, t):
         visited = [False] * n
-        queue = []
-        queue.append(s)
+        stack = [s]
         visited[s] = True
         parent[:] = [-1] * n
-        while queue:
-            u = queue.pop(0)
-            for v in range(n):
-                if not visited[v] and residual[u][v] > 0:
-                    queue.append(v)
+        while stack:
+            u = stack.pop()
+            for v, c in residual[u].items():
+                if not visited[v] and c > 0:
+                    stack.append(v)
                     visited[v] = True
                     parent[v] = u
                     if v == t:
                         return True
         return False
 
-    residual = [row[:] for row in capacity_matrix]
     max_flow = 0
 
-    while bfs(residual, source, sink):
+    while dfs(residual, source, sink):
         path_flow = float("inf")
         v = sink
         while v != source:
@@ -0,0 +1,347 @@
+from array import array
+from collections import deque
+from algo.graph import CSRGraph
+
+class ResidualGraph:
+    """Graphe résiduel stocké par tableaux d'arcs (forward-star).
+
+    L'arc 2k est l'arc d'origine et 2k+1 son arc inverse (capacité
+    résiduelle initiale nulle), donc e ^ 1 donne toujours l'arc opposé.
+    head[u] est le premier arc sortant de u et nxt[e] l'arc suivant.
+    La mémoire est en O(V + E), sans matrice n x n.
+    """
+
+    __slots__ = ("n", "head", "to", "cap", "nxt", "labels", "index")
+
+    def __init__(self, n, labels=None):
+        self.n = n
+        self.head = array("q", [-1]) * n
+        self.to = array("q")
+        self.cap = array("q")
+        self.nxt = array("q")
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)} if labels is not None else None
+
+    @classmethod
+    def from_graph(cls, graph):
+        if isinstance(graph, dict):
+            graph = CSRGraph.from_adjacency(graph)
+        if isinstance(graph, CSRGraph):
+            g = cls(graph.num_nodes, graph.labels)
+            for u, v, c in graph.edges():
+                g.add_edge(u, v, c)
+            return g
+        g = cls(len(graph))
+        for u, row in enumerate(graph):
+            for v, c in enumerate(row):
+                if c != 0:
+                    g.add_edge(u, v, c)
+        return g
+
+    def add_edge(self, u, v, c):
+        if self.cap.typecode == "q" and not isinstance(c, int):
+            self.cap = array("d", self.cap)
+        for a, b, capacity in ((u, v, c), (v, u, 0)):
+            self.to.append(b)
+            self.cap.append(capacity)
+            self.nxt.append(self.head[a])
+            self.head[a] = len(self.to) - 1
+        return len(self.to) - 2
+
+    def node_id(self, u):
+        return self.index[u] if self.index is not None else u
+
+    def _push_path(self, path):
+        cap = self.cap
+        f = min(cap[e] for e in path)
+        for e in path:
+            cap[e] -= f
+            cap[e ^ 1] += f
+        return f
+
+def _bfs_path(g, s, t):
+    head, to, cap, nxt = g.head, g.to, g.cap, g.nxt
+    via = array("q", [-1]) * g.n
+    via[s] = -2
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        e = head[u]
+        while e != -1:
+            v = to[e]
+            if cap[e] > 0 and via[v] == -1:
+                via[v] = e
+                if v == t:
+                    path = []
+                    while v != s:
+                        path.append(via[v])
+                        v = to[via[v] ^ 1]
+                    return path
+                queue.append(v)
+            e = nxt[e]
+    return None
+
+def _edmonds_karp(g, s, t):
+    flow = 0
+    path = _bfs_path(g, s, t)
+    while path is not None:
+        flow += g._push_path(path)
+        path = _bfs_path(g, s, t)
+    return flow
+
+def _dinic_levels(g, s, t):
+    head, to, cap, nxt = g.head, g.to, g.cap, g.nxt
+    level = array("q", [-1]) * g.n
+    level[s] = 0
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        e = head[u]
+        while e != -1:
+            v = to[e]
+            if cap[e] > 0 and level[v] < 0:
+                level[v] = level[u] + 1
+                queue.append(v)
+            e = nxt[e]
+    return level if level[t] >= 0 else None
+
+def _dinic(g, s, t):
+    to, cap, nxt = g.to, g.cap, g.nxt
+    flow = 0
+    level = _dinic_levels(g, s, t)
+    while level is not None:
+        it = array("q", g.head)
+        path = []
+        u = s
+        # flot bloquant : DFS itératif sur le graphe de niveaux
+        while True:
+            if u == t:
+                f = g._push_path(path)
+                flow += f
+                # on repart de l'origine du premier arc saturé
+                for k, e in enumerate(path):
+                    if cap[e] == 0:
+                        del path[k:]
+                        break
+                u = to[path[-1]] if path else s
+                continue
+            e = it[u]
+            while e != -1 and not (cap[e] > 0 and level[to[e]] == level[u] + 1):
+                e = nxt[e]
+            it[u] = e
+            if e != -1:
+                path.append(e)
+                u = to[e]
+                continue
+            # impasse : u n'est plus utile dans cette phase
+            level[u] = -1
+            if not path:
+                break
+            e = path.pop()
+            u = to[e ^ 1]
+            it[u] = nxt[it[u]]
+        level = _dinic_levels(g, s, t)
+    return flow
+
+def _push_relabel(g, s, t):
+    n = g.n
+    head, to, cap, nxt = g.head, g.to, g.cap, g.nxt
+    height = [0] * n
+    excess = [0] * n
+    count = [0] * (2 * n + 1)
+    buckets = [[] for _ in range(2 * n + 1)]
+    it = array("q", head)
+    height[s] = n
+    count[0] = n - 1
+    count[n] = 1
+
+    top = 0
+
+    def activate(v):
+        nonlocal top
+        if v != s and v != t and excess[v] == 0:
+            buckets[height[v]].append(v)
+            top = max(top, height[v])
+
+    e = head[s]
+    while e != -1:
+        c = cap[e]
+        if c > 0:
+            v = to[e]
+            activate(v)
+            cap[e] = 0
+            cap[e ^ 1] += c
+            excess[v] += c
+            excess[s] -= c
+        e = nxt[e]
+
+    while True:
+        while top >= 0 and not buckets[top]:
+            top -= 1
+        if top < 0:
+            break
+        u = buckets[top].pop()
+        # décharge de u (sommet actif de plus grande hauteur)
+        while excess[u] > 0:
+            e = it[u]
+            if e == -1:
+                old = height[u]
+                new = 2 * n
+                e = head[u]
+                while e != -1:
+                    if cap[e] > 0 and height[to[e]] + 1 < new:
+                        new = height[to[e]] + 1
+                    e = nxt[e]
+                count[old] -= 1
+                height[u] = new
+                count[new] += 1
+                it[u] = head[u]
+                if count[old] == 0 and old < n:
+                    # heuristique du trou : plus aucun chemin vers t au-dessus de old
+                    for v in range(n):
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n + 1
+                            count[n + 1] += 1
+                            if excess[v] > 0 and v != u:
+                                buckets[n + 1].append(v)
+                                top = max(top, n + 1)
+                    for h in range(old + 1, n):
+                        buckets[h] = [v for v in buckets[h] if height[v] == h]
+                continue
+            v = to[e]
+            if cap[e] > 0 and height[u] == height[v] + 1:
+                d = min(excess[u], cap[e])
+                activate(v)
+                cap[e] -= d
+                cap[e ^ 1] += d
+                excess[u] -= d
+                excess[v] += d
+                if cap[e] > 0:
+                    continue
+            it[u] = nxt[e]
+    return excess[t]
+
+METHODS = {
+    "dinic": _dinic,
+    "push_relabel": _push_relabel,
+    "edmonds_karp": _edmonds_karp,
+}
+
+class FlowState:
+    """Flot maximum calculé, conservé avec son graphe résiduel.
+
+    Donne le flot par arc et la coupe minimum, et accepte des variations de
+    capacité : le flot existant est réparé localement puis complété par de
+    nouvelles augmentations, sans repartir de zéro.
+    """
+
+    def __init__(self, graph, source, sink, method="dinic"):
+        if method not in METHODS:
+            raise ValueError(f"méthode inconnue : {method}")
+        self.method = method
+        self.residual = ResidualGraph.from_graph(graph)
+        self.source = self.residual.node_id(source)
+        self.sink = self.residual.node_id(sink)
+        self._arcs = {}
+        to = self.residual.to
+        for e in range(0, len(to), 2):
+            self._arcs.setdefault((to[e ^ 1], to[e]), e)
+        self.value = 0
+        self.resolve()
+
+    def _label(self, u):
+        return self.residual.labels[u] if self.residual.labels is not None else u
+
+    def resolve(self):
+        self.value += METHODS[self.method](self.residual, self.source, self.sink)
+        return self.value
+
+    def flows(self):
+        """Flot positif sur chaque arc : {(u, v): flot}."""
+        g = self.residual
+        result = {}
+        for e in range(0, len(g.to), 2):
+            f = g.cap[e ^ 1]
+            if f > 0:
+                key = (self._label(g.to[e ^ 1]), self._label(g.to[e]))
+                result[key] = result.get(key, 0) + f
+        return result
+
+    def min_cut(self):
+        """Sommets du côté de la source dans une coupe minimum."""
+        g = self.residual
+        seen = bytearray(g.n)
+        seen[self.source] = 1
+        stack = [self.source]
+        while stack:
+            u = stack.pop()
+            e = g.head[u]
+            while e != -1:
+                v = g.to[e]
+                if g.cap[e] > 0 and not seen[v]:
+                    seen[v] = 1
+                    stack.append(v)
+                e = g.nxt[e]
+        return {self._label(u) for u in range(g.n) if seen[u]}
+
+    def cut_edges(self):
+        side = self.min_cut()
+        return [(u, v) for u, v in self.flows() if u in side and v not in side]
+
+    def _route(self, a, b, amount):
+        g = self.residual
+        while amount > 0 and a != b:
+            path = _bfs_path(g, a, b)
+            if path is None:
+                break
+            f = min(amount, min(g.cap[e] for e in path))
+            for e in path:
+                g.cap[e] -= f
+                g.cap[e ^ 1] += f
+            amount -= f
+        return amount
+
+    def update_capacity(self, u, v, delta):
+        """Modifie la capacité de l'arc u -> v de delta (sans recalcul)."""
+        g = self.residual
+        a, b = g.node_id(u), g.node_id(v)
+        e = self._arcs.get((a, b))
+        if e is None:
+            if delta < 0:
+                raise ValueError(f"capacité négative pour l'arc {u} -> {v}")
+            self._arcs[(a, b)] = g.add_edge(a, b, delta)
+            return
+        flow = g.cap[e ^ 1]
+        capacity = g.cap[e] + flow + delta
+        if capacity < 0:
+            raise ValueError(f"capacité négative pour l'arc {u} -> {v}")
+        if capacity >= flow:
+            g.cap[e] += delta
+            return
+        # le flot dépasse la nouvelle capacité : on retire le surplus de l'arc,
+        # on tente de le contourner de a vers b, sinon on le renvoie vers la
+        # source (depuis a) et on l'annule côté puits (jusqu'à b)
+        surplus = flow - capacity
+        g.cap[e] = 0
+        g.cap[e ^ 1] = capacity
+        left = self._route(a, b, surplus)
+        if left > 0:
+            self._route(a, self.source, left)
+            self._route(self.sink, b, left)
+            self.value -= left
+
+    def update(self, deltas):
+        """Applique {(u, v): delta} puis complète le flot ; renvoie sa valeur."""
+        for (u, v), delta in deltas.items():
+            self.update_capacity(u, v, delta)
+        return self.resolve()
+
+def max_flow(graph, source, sink, method="dinic"):
+    """Valeur du flot maximum de source à sink.
+
+    `graph` est une matrice de capacités (sommets = indices), un CSRGraph ou
+    un dictionnaire {u: [(v, capacité), ...]} (sommets = étiquettes).
+    `method` vaut "dinic", "push_relabel" ou "edmonds_karp".
+    """
+    return FlowState(graph, source, sink, method).value
@@ -0,0 +1,92 @@
+import heapq
+import os
+import pickle
+import tempfile
+from array import array
+from itertools import islice
+from algo.EX5.quicksort import quicksort_inplace
+
+# nombre d'éléments triés en mémoire avant d'être écrits sur disque
+RUN_SIZE = 1 << 20
+# nombre d'éléments lus ou écrits à la fois dans un fichier de run
+BLOCK_SIZE = 4096
+# marque la fin de l'entrée
+_END = object()
+
+def _write_run(run, directory, typecode):
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".run")
+    with os.fdopen(fd, "wb") as f:
+        if typecode is not None:
+            array(typecode, run).tofile(f)
+        else:
+            for i in range(0, len(run), BLOCK_SIZE):
+                pickle.dump(run[i:i + BLOCK_SIZE], f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+def _read_run(path, typecode):
+    with open(path, "rb") as f:
+        if typecode is not None:
+            itemsize = array(typecode).itemsize
+            while True:
+                data = f.read(itemsize * BLOCK_SIZE)
+                if not data:
+                    return
+                yield from array(typecode, data)
+        else:
+            while True:
+                try:
+                    block = pickle.load(f)
+                except EOFError:
+                    return
+                yield from block
+
+def external_sort(iterable, key=None, run_size=RUN_SIZE, typecode=None, tmp_dir=None):
+    """Tri externe : générateur des éléments de `iterable` dans l'ordre.
+
+    L'entrée est lue par runs de `run_size` éléments, chacun trié par
+    quicksort_inplace puis écrit dans un fichier temporaire : tableau
+    binaire brut si `typecode` (code du module array) est donné, blocs
+    pickle sinon. Les runs sont ensuite fusionnés par un tas (k-way merge).
+    La mémoire utilisée reste en O(run_size + k * BLOCK_SIZE).
+    """
+    it = iter(iterable)
+    run = list(islice(it, run_size))
+    quicksort_inplace(run, key=key)
+    # un seul élément lu en avance : deux runs ne sont jamais en mémoire
+    first = next(it, _END)
+    if first is _END:
+        # tout tient en mémoire : pas de fichier temporaire
+        yield from run
+        return
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="extsort-") as directory:
+        paths = [_write_run(run, directory, typecode)]
+        run.clear()
+        run.append(first)
+        run.extend(islice(it, run_size - 1))
+        while run:
+            quicksort_inplace(run, key=key)
+            paths.append(_write_run(run, directory, typecode))
+            run.clear()
+            run.extend(islice(it, run_size))
+        del run
+        yield from heapq.merge(*(_read_run(p, typecode) for p in paths), key=key)
+
+def sort_file(path, output=None, key=None, run_size=RUN_SIZE, tmp_dir=None, encoding="utf-8"):
+    """Trie les lignes d'un fichier texte (équivalent de `sort` en ligne de commande).
+
+    Écrit le résultat dans `output` si donné, sinon renvoie un générateur
+    des lignes triées (sans le saut de ligne final).
+    """
+    def lines():
+        with open(path, "r", encoding=encoding) as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+    result = external_sort(lines(), key=key, run_size=run_size, tmp_dir=tmp_dir)
+    if output is None:
+        return result
+    with open(output, "w", encoding=encoding) as out:
+        for line in result:
+            out.write(line)
+            out.write("\n")
+    return output
@@ -1,18 +1,224 @@
+import os
 import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 
-def deterministic_quicksort(arr):
-    if len(arr) <= 1:
-        return arr[:]
-    pivot = arr[-1]
-    less = [x for x in arr[:-1] if x <= pivot]
-    greater = [x for x in arr[:-1] if x > pivot]
-    return deterministic_quicksort(less) + [pivot] + deterministic_quicksort(greater)
-
-def randomized_quicksort(arr):
-    if len(arr) <= 1:
-        return arr[:]
-    pivot = random.choice(arr)
-    less = [x for x in arr if x < pivot]
-    equal = [x for x in arr if x == pivot]
-    greater = [x for x in arr if x > pivot]
-    return randomized_quicksort(less) + equal + randomized_quicksort(greater)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# en dessous de cette taille, le tri par insertion est plus rapide
+INSERTION_CUTOFF = 16
+NINTHER_THRESHOLD = 40
+SAMPLES_PER_BUCKET = 32
+
+def _swap(keys, items, i, j):
+    keys[i], keys[j] = keys[j], keys[i]
+    if items is not None:
+        items[i], items[j] = items[j], items[i]
+
+def _insertion_sort(keys, items, lo, hi):
+    for i in range(lo + 1, hi):
+        k = keys[i]
+        if items is not None:
+            x = items[i]
+        j = i - 1
+        while j >= lo and k < keys[j]:
+            keys[j + 1] = keys[j]
+            if items is not None:
+                items[j + 1] = items[j]
+            j -= 1
+        keys[j + 1] = k
+        if items is not None:
+            items[j + 1] = x
+
+def _sift_down(keys, items, lo, root, size):
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+        if child + 1 < size and keys[lo + child] < keys[lo + child + 1]:
+            child += 1
+        if not keys[lo + root] < keys[lo + child]:
+            return
+        _swap(keys, items, lo + root, lo + child)
+        root = child
+
+def _heapsort(keys, items, lo, hi):
+    size = hi - lo
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(keys, items, lo, root, size)
+    for end in range(size - 1, 0, -1):
+        _swap(keys, items, lo, lo + end)
+        _sift_down(keys, items, lo, 0, end)
+
+def _median3(keys, a, b, c):
+    ka, kb, kc = keys[a], keys[b], keys[c]
+    if ka < kb:
+        if kb < kc:
+            return b
+        return c if ka < kc else a
+    if ka < kc:
+        return a
+    return c if kb < kc else b
+
+def _choose_pivot(keys, lo, hi, rng):
+    if rng is not None:
+        return keys[rng.randrange(lo, hi)]
+    mid = (lo + hi) // 2
+    last = hi - 1
+    if hi - lo < NINTHER_THRESHOLD:
+        return keys[_median3(keys, lo, mid, last)]
+    step = (hi - lo) // 8
+    return keys[_median3(
+        keys,
+        _median3(keys, lo, lo + step, lo + 2 * step),
+        _median3(keys, mid - step, mid, mid + step),
+        _median3(keys, last - 2 * step, last - step, last),
+    )]
+
+def _partition3(keys, items, lo, hi, pivot):
+    # drapeau hollandais : [lo, lt) < pivot, [lt, gt) == pivot, [gt, hi) > pivot
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        k = keys[i]
+        if k < pivot:
+            _swap(keys, items, lt, i)
+            lt += 1
+            i += 1
+        elif pivot < k:
+            gt -= 1
+            _swap(keys, items, i, gt)
+        else:
+            i += 1
+    return lt, gt
+
+def quicksort_inplace(arr, key=None, randomized=False, rng=None):
+    """Tri rapide en place, itératif, de type introsort.
+
+    Pivot médiane de trois (ninther pour les grandes tranches) ou aléatoire,
+    partition à trois voies pour les doublons, tri par insertion sous
+    INSERTION_CUTOFF éléments et bascule sur le tri par tas quand la
+    profondeur dépasse 2 log2(n). La pile explicite reste en O(log n).
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+    if key is None:
+        keys, items = arr, None
+    else:
+        keys, items = [key(x) for x in arr], arr
+    if randomized and rng is None:
+        rng = random
+    elif not randomized:
+        rng = None
+    stack = [(0, n, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > INSERTION_CUTOFF:
+            if depth == 0:
+                _heapsort(keys, items, lo, hi)
+                break
+            depth -= 1
+            lt, gt = _partition3(keys, items, lo, hi, _choose_pivot(keys, lo, hi, rng))
+            # on empile la plus grande partie et on continue sur la plus petite
+            if lt - lo > hi - gt:
+                stack.append((lo, lt, depth))
+                lo = gt
+            else:
+                stack.append((gt, hi, depth))
+                hi = lt
+        else:
+            _insertion_sort(keys, items, lo, hi)
+    return arr
+
+def deterministic_quicksort(arr, key=None):
+    return quicksort_inplace(list(arr), key=key)
+
+def randomized_quicksort(arr, key=None):
+    return quicksort_inplace(list(arr), key=key, randomized=True)
+
+def _numeric_dtype(arr):
+    if np is not None and isinstance(arr, np.ndarray):
+        return arr.dtype if arr.dtype.kind in "iuf" else None
+    if isinstance(arr, array):
+        return arr.typecode if arr.typecode != "u" else None
+    if not arr:
+        return None
+    # tous du même type, sinon le passage par un tampon changerait les types
+    kind = type(arr[0])
+    if kind is float:
+        return "d" if all(type(x) is float for x in arr) else None
+    if kind is int:
+        if all(type(x) is int for x in arr) and -2 ** 63 <= min(arr) and max(arr) < 2 ** 63:
+            return "q"
+    return None
+
+def _sort_bucket(bucket):
+    if np is not None and isinstance(bucket, np.ndarray):
+        bucket.sort()
+        return bucket
+    return quicksort_inplace(bucket)
+
+def parallel_sort(arr, workers=None, rng=None):
+    """Tri par échantillonnage (sample sort) sur plusieurs processus.
+
+    Des séparateurs tirés d'un échantillon découpent les données en
+    `workers` paquets d'intervalles disjoints, triés chacun dans un
+    processus puis simplement concaténés. Les données numériques passent par
+    des tableaux NumPy quand NumPy est disponible.
+    """
+    workers = workers or os.cpu_count() or 1
+    rng = rng or random
+    n = len(arr)
+    if workers < 2 or n < 2 * workers:
+        return sort(arr, workers=1)
+    sample = quicksort_inplace([arr[rng.randrange(n)] for _ in range(workers * SAMPLES_PER_BUCKET)])
+    splitters = sample[SAMPLES_PER_BUCKET::SAMPLES_PER_BUCKET][:workers - 1]
+    dtype = _numeric_dtype(arr)
+    if np is not None and dtype is not None:
+        data = np.asarray(arr, dtype=dtype)
+        which = np.searchsorted(np.asarray(splitters, dtype=data.dtype), data, side="right")
+        buckets = [data[which == b] for b in range(workers)]
+    else:
+        buckets = [[] for _ in range(workers)]
+        for x in arr:
+            buckets[bisect_right(splitters, x)].append(x)
+    with ProcessPoolExecutor(workers) as pool:
+        parts = list(pool.map(_sort_bucket, buckets))
+    if np is not None and dtype is not None:
+        return _like(arr, np.concatenate(parts))
+    result = []
+    for part in parts:
+        result.extend(part)
+    return _like(arr, result)
+
+def _like(arr, result):
+    if np is not None and isinstance(result, np.ndarray):
+        if isinstance(arr, np.ndarray):
+            return result
+        if isinstance(arr, array):
+            return array(arr.typecode, result.tobytes())
+        return result.tolist()
+    if isinstance(arr, array):
+        return array(arr.typecode, result)
+    return result
+
+def sort(arr, key=None, workers=None):
+    """Renvoie une copie triée de arr en choisissant la méthode la plus rapide.
+
+    Sans `key`, une entrée numérique homogène est triée dans un tampon NumPy
+    (si NumPy est installé). Le tri n'est réparti entre processus
+    (parallel_sort) que si l'appelant le demande avec `workers` > 1 : envoyer
+    chaque élément à un autre processus coûte plus cher qu'un np.sort.
+    Sinon, on utilise quicksort_inplace sur une copie.
+    """
+    if key is None:
+        if workers is not None and workers > 1:
+            return parallel_sort(arr, workers)
+        dtype = _numeric_dtype(arr)
+        if np is not None and dtype is not None:
+            return _like(arr, np.sort(np.asarray(arr, dtype=dtype), kind="quicksort"))
+    return _like(arr, quicksort_inplace(list(arr), key=key))
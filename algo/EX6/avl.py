@@ -1,15 +1,23 @@
 class Node:
-    def __init__(self, key):
+    __slots__ = ("key", "value", "left", "right", "height", "size")
+
+    def __init__(self, key, value=None):
         self.key = key
+        self.value = value
         self.left = None
         self.right = None
         self.height = 1
+        self.size = 1
 
 def get_height(n):
     return n.height if n else 0
 
+def get_size(n):
+    return n.size if n else 0
+
 def update_height(n):
     n.height = 1 + max(get_height(n.left), get_height(n.right))
+    n.size = 1 + get_size(n.left) + get_size(n.right)
 
 def get_balance(n):
     return get_height(n.left) - get_height(n.right) if n else 0
@@ -88,9 +96,557 @@ def delete(root, key):
         return rotate_left(root)
     return root
 
+def iter_nodes(root):
+    stack = []
+    node = root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
 def inorder(root, result):
-    if root:
-        inorder(root.left, result)
-        result.append((root.key, root.height))
-        inorder(root.right, result)
+    for n in iter_nodes(root):
+        result.append((n.key, n.height))
     return result
+
+def rebalance(n):
+    update_height(n)
+    balance = get_balance(n)
+    if balance > 1:
+        if get_balance(n.left) < 0:
+            n.left = rotate_left(n.left)
+        return rotate_right(n)
+    if balance < -1:
+        if get_balance(n.right) > 0:
+            n.right = rotate_right(n.right)
+        return rotate_left(n)
+    return n
+
+def build_sorted(keys, values=None):
+    """Construit en O(n) un arbre équilibré à partir de clés triées."""
+    keys = list(keys)
+    values = list(values) if values is not None else None
+
+    def build(lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        n = Node(keys[mid], values[mid] if values is not None else None)
+        n.left = build(lo, mid)
+        n.right = build(mid + 1, hi)
+        update_height(n)
+        return n
+
+    return build(0, len(keys))
+
+def join(left, node, right):
+    """Assemble left, node et right (clés de left < node.key < clés de right)."""
+    hl, hr = get_height(left), get_height(right)
+    if hl > hr + 1:
+        left.right = join(left.right, node, right)
+        return rebalance(left)
+    if hr > hl + 1:
+        right.left = join(left, node, right.left)
+        return rebalance(right)
+    node.left = left
+    node.right = right
+    update_height(node)
+    return node
+
+def pop_min(n):
+    if n.left is None:
+        return n.right, n
+    n.left, m = pop_min(n.left)
+    return rebalance(n), m
+
+def join2(left, right):
+    if right is None:
+        return left
+    right, m = pop_min(right)
+    return join(left, m, right)
+
+def split(n, key):
+    """Découpe n en (clés < key, nœud de clé key ou None, clés > key)."""
+    if n is None:
+        return None, None, None
+    left, right = n.left, n.right
+    if key < n.key:
+        l, m, r = split(left, key)
+        return l, m, join(r, n, right)
+    if n.key < key:
+        l, m, r = split(right, key)
+        return join(left, n, l), m, r
+    return left, n, right
+
+def union(a, b):
+    # en cas de clé commune, la valeur de b l'emporte
+    if a is None:
+        return b
+    if b is None:
+        return a
+    left, right = a.left, a.right
+    lb, m, rb = split(b, a.key)
+    if m is not None:
+        a.value = m.value
+    return join(union(left, lb), a, union(right, rb))
+
+def intersection(a, b):
+    # on garde les nœuds (et les valeurs) de a
+    if a is None or b is None:
+        return None
+    left, right = a.left, a.right
+    lb, m, rb = split(b, a.key)
+    l = intersection(left, lb)
+    r = intersection(right, rb)
+    if m is None:
+        return join2(l, r)
+    return join(l, a, r)
+
+def copy_node(n):
+    c = Node(n.key, n.value)
+    c.left = n.left
+    c.right = n.right
+    c.height = n.height
+    c.size = n.size
+    return c
+
+def _rebalance_copy(n):
+    # n est déjà une copie privée ; on copie aussi les nœuds que la rotation modifie
+    update_height(n)
+    balance = get_balance(n)
+    if balance > 1:
+        n.left = copy_node(n.left)
+        if get_balance(n.left) < 0:
+            n.left.right = copy_node(n.left.right)
+            n.left = rotate_left(n.left)
+        return rotate_right(n)
+    if balance < -1:
+        n.right = copy_node(n.right)
+        if get_balance(n.right) > 0:
+            n.right.left = copy_node(n.right.left)
+            n.right = rotate_right(n.right)
+        return rotate_left(n)
+    return n
+
+def persistent_insert(n, key, value, replace):
+    """Insertion par copie de chemin : renvoie (nouvelle racine, ajouté ?).
+
+    Aucun nœud existant n'est modifié ; seuls O(log n) nœuds sont copiés.
+    """
+    if n is None:
+        return Node(key, value), True
+    if key < n.key or n.key < key:
+        went_left = key < n.key
+        child, added = persistent_insert(n.left if went_left else n.right, key, value, replace)
+        if child is (n.left if went_left else n.right):
+            return n, added
+        c = copy_node(n)
+        if went_left:
+            c.left = child
+        else:
+            c.right = child
+        return _rebalance_copy(c), added
+    if not replace:
+        return n, False
+    c = copy_node(n)
+    c.value = value
+    return c, False
+
+def persistent_pop_min(n):
+    if n.left is None:
+        return n.right, n
+    left, m = persistent_pop_min(n.left)
+    c = copy_node(n)
+    c.left = left
+    return _rebalance_copy(c), m
+
+def persistent_delete(n, key):
+    """Suppression par copie de chemin : renvoie (nouvelle racine, nœud retiré ou None)."""
+    if n is None:
+        return None, None
+    if key < n.key or n.key < key:
+        went_left = key < n.key
+        child, removed = persistent_delete(n.left if went_left else n.right, key)
+        if removed is None:
+            return n, None
+        c = copy_node(n)
+        if went_left:
+            c.left = child
+        else:
+            c.right = child
+        return _rebalance_copy(c), removed
+    if n.left is None:
+        return n.right, n
+    if n.right is None:
+        return n.left, n
+    right, succ = persistent_pop_min(n.right)
+    c = copy_node(succ)
+    c.left = n.left
+    c.right = right
+    return _rebalance_copy(c), n
+
+def persistent_join(left, node, right):
+    """join par copie de chemin : node est copié, left et right restent intacts."""
+    hl, hr = get_height(left), get_height(right)
+    if hl > hr + 1:
+        c = copy_node(left)
+        c.right = persistent_join(left.right, node, right)
+        return _rebalance_copy(c)
+    if hr > hl + 1:
+        c = copy_node(right)
+        c.left = persistent_join(left, node, right.left)
+        return _rebalance_copy(c)
+    c = copy_node(node)
+    c.left = left
+    c.right = right
+    update_height(c)
+    return c
+
+def persistent_join2(left, right):
+    if right is None:
+        return left
+    right, m = persistent_pop_min(right)
+    return persistent_join(left, m, right)
+
+def persistent_split(n, key):
+    """split par copie de chemin : aucun nœud de n n'est modifié."""
+    if n is None:
+        return None, None, None
+    if key < n.key:
+        l, m, r = persistent_split(n.left, key)
+        return l, m, persistent_join(r, n, n.right)
+    if n.key < key:
+        l, m, r = persistent_split(n.right, key)
+        return persistent_join(n.left, n, l), m, r
+    return n.left, n, n.right
+
+def persistent_union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    lb, m, rb = persistent_split(b, a.key)
+    node = a if m is None else Node(a.key, m.value)
+    return persistent_join(persistent_union(a.left, lb), node, persistent_union(a.right, rb))
+
+def persistent_intersection(a, b):
+    if a is None or b is None:
+        return None
+    lb, m, rb = persistent_split(b, a.key)
+    l = persistent_intersection(a.left, lb)
+    r = persistent_intersection(a.right, rb)
+    if m is None:
+        return persistent_join2(l, r)
+    return persistent_join(l, a, r)
+
+class AVLTree:
+    """Arbre AVL de clés distinctes, sans récursion pour les mises à jour.
+
+    Chaque nœud connaît la taille de son sous-arbre, ce qui donne rank et
+    select en O(log n). Insertion et suppression descendent en mémorisant
+    le chemin, puis rééquilibrent en remontant.
+
+    Avec persistent=True, les mises à jour copient le chemin modifié au lieu
+    de changer les nœuds en place, puis remplacent la racine d'un seul coup :
+    un snapshot() (en O(1)) reste alors valide et immuable pendant que
+    l'arbre continue d'évoluer, et peut être lu depuis d'autres threads
+    sans verrou.
+    """
+
+    __slots__ = ("root", "persistent")
+
+    def __init__(self, keys=(), persistent=False):
+        self.root = None
+        self.persistent = persistent
+        for key in keys:
+            self.insert(key)
+
+    @classmethod
+    def from_sorted(cls, keys, values=None, persistent=False):
+        tree = cls(persistent=persistent)
+        tree.root = build_sorted(keys, values)
+        return tree
+
+    def snapshot(self):
+        """Vue figée de l'arbre : partage les nœuds en mode persistant, copie sinon."""
+        if not self.persistent:
+            items = list(self.items())
+            return AVLTree.from_sorted([k for k, _ in items], [v for _, v in items])
+        tree = AVLTree(persistent=True)
+        tree.root = self.root
+        return tree
+
+    def _own_nodes(self):
+        # un arbre non persistant qui absorbe un arbre persistant modifierait
+        # ses nœuds, partagés avec ses snapshots : on en fait d'abord une copie
+        if self.persistent and self.root is not None:
+            items = list(self.items())
+            self.root = build_sorted([k for k, _ in items], [v for _, v in items])
+
+    def __len__(self):
+        return get_size(self.root)
+
+    def __iter__(self):
+        for n in iter_nodes(self.root):
+            yield n.key
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    @property
+    def height(self):
+        return get_height(self.root)
+
+    def _find(self, key):
+        n = self.root
+        while n:
+            if key < n.key:
+                n = n.left
+            elif n.key < key:
+                n = n.right
+            else:
+                return n
+        return None
+
+    def _retrace(self, path, child):
+        for parent, went_left in reversed(path):
+            if went_left:
+                parent.left = child
+            else:
+                parent.right = child
+            child = rebalance(parent)
+        self.root = child
+
+    def _insert(self, key, value, replace):
+        if self.persistent:
+            self.root, added = persistent_insert(self.root, key, value, replace)
+            return added
+        path = []
+        n = self.root
+        while n:
+            if key < n.key:
+                path.append((n, True))
+                n = n.left
+            elif n.key < key:
+                path.append((n, False))
+                n = n.right
+            else:
+                if replace:
+                    n.value = value
+                return False
+        self._retrace(path, Node(key, value))
+        return True
+
+    def insert(self, key, value=None):
+        """Ajoute key si elle est absente ; renvoie True si elle a été ajoutée."""
+        return self._insert(key, value, False)
+
+    def put(self, key, value):
+        """Associe value à key (remplace l'ancienne valeur) ; True si key est nouvelle."""
+        return self._insert(key, value, True)
+
+    def get(self, key, default=None):
+        n = self._find(key)
+        return n.value if n is not None else default
+
+    def __getitem__(self, key):
+        n = self._find(key)
+        if n is None:
+            raise KeyError(key)
+        return n.value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def pop(self, key, *default):
+        n = self._find(key)
+        if n is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = n.value
+        self.delete(key)
+        return value
+
+    def delete(self, key):
+        if self.persistent:
+            self.root, removed = persistent_delete(self.root, key)
+            return removed is not None
+        path = []
+        n = self.root
+        while n and (key < n.key or n.key < key):
+            went_left = key < n.key
+            path.append((n, went_left))
+            n = n.left if went_left else n.right
+        if n is None:
+            return False
+        if n.left and n.right:
+            # on remplace la clé par celle du successeur, puis on retire celui-ci
+            path.append((n, False))
+            succ = n.right
+            while succ.left:
+                path.append((succ, True))
+                succ = succ.left
+            n.key = succ.key
+            n.value = succ.value
+            n = succ
+        self._retrace(path, n.left or n.right)
+        return True
+
+    def min(self):
+        n = self.root
+        if n is None:
+            raise ValueError("arbre vide")
+        while n.left:
+            n = n.left
+        return n.key
+
+    def max(self):
+        n = self.root
+        if n is None:
+            raise ValueError("arbre vide")
+        while n.right:
+            n = n.right
+        return n.key
+
+    def rank(self, key):
+        """Nombre de clés strictement inférieures à key."""
+        r = 0
+        n = self.root
+        while n:
+            if n.key < key:
+                r += get_size(n.left) + 1
+                n = n.right
+            else:
+                n = n.left
+        return r
+
+    def select(self, i):
+        """i-ème plus petite clé (à partir de 0)."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        n = self.root
+        while True:
+            left = get_size(n.left)
+            if i < left:
+                n = n.left
+            elif i == left:
+                return n.key
+            else:
+                i -= left + 1
+                n = n.right
+
+    def irange(self, lo=None, hi=None):
+        """Itère paresseusement sur les clés k telles que lo <= k < hi."""
+        for key, _ in self.range(lo, hi):
+            yield key
+
+    def items(self):
+        for n in iter_nodes(self.root):
+            yield n.key, n.value
+
+    def range(self, lo=None, hi=None):
+        """Itère paresseusement sur les couples (clé, valeur) avec lo <= clé < hi."""
+        stack = []
+        n = self.root
+        while n:
+            if lo is not None and n.key < lo:
+                n = n.right
+            else:
+                stack.append(n)
+                n = n.left
+        while stack:
+            n = stack.pop()
+            if hi is not None and not n.key < hi:
+                return
+            yield n.key, n.value
+            n = n.right
+            while n:
+                stack.append(n)
+                n = n.left
+
+    def floor(self, key):
+        """Plus grande clé <= key, ou None."""
+        best = None
+        n = self.root
+        while n:
+            if key < n.key:
+                n = n.left
+            else:
+                best = n.key
+                if not n.key < key:
+                    break
+                n = n.right
+        return best
+
+    def ceiling(self, key):
+        """Plus petite clé >= key, ou None."""
+        best = None
+        n = self.root
+        while n:
+            if n.key < key:
+                n = n.right
+            else:
+                best = n.key
+                if not key < n.key:
+                    break
+                n = n.left
+        return best
+
+    def split(self, key):
+        """Vide l'arbre en deux arbres : clés < key et clés >= key."""
+        if self.persistent:
+            left, m, right = persistent_split(self.root, key)
+            if m is not None:
+                right = persistent_join(None, m, right)
+        else:
+            left, m, right = split(self.root, key)
+            if m is not None:
+                right = join(None, m, right)
+        self.root = None
+        lower, upper = AVLTree(persistent=self.persistent), AVLTree(persistent=self.persistent)
+        lower.root, upper.root = left, right
+        return lower, upper
+
+    def join(self, other):
+        """Ajoute à la fin les clés de other (toutes supérieures) ; vide other."""
+        if self.persistent:
+            self.root = persistent_join2(self.root, other.root)
+        else:
+            other._own_nodes()
+            self.root = join2(self.root, other.root)
+        other.root = None
+        return self
+
+    def union(self, other):
+        """Fusionne other dans cet arbre en O(m log(n/m + 1)) ; vide other.
+
+        Pour une clé commune, la valeur de other l'emporte. En mode
+        persistant, seuls les nœuds visités sont copiés.
+        """
+        if self.persistent:
+            self.root = persistent_union(self.root, other.root)
+        else:
+            other._own_nodes()
+            self.root = union(self.root, other.root)
+        other.root = None
+        return self
+
+    def intersection(self, other):
+        """Ne garde que les clés présentes dans other (avec les valeurs de self) ; vide other."""
+        if self.persistent:
+            self.root = persistent_intersection(self.root, other.root)
+        else:
+            other._own_nodes()
+            self.root = intersection(self.root, other.root)
+        other.root = None
+        return self
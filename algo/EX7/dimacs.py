@@ -0,0 +1,137 @@
+import bz2
+import gzip
+import lzma
+from array import array
+
+_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+_NOTATION = str.maketrans({"(": " ", ")": " ", "∨": " "})
+
+
+class ClauseStore:
+    """Ensemble de clauses stocké à plat : littéraux DIMACS dans un
+    array('i') et début de chaque clause dans `offsets`.
+
+    store[i] renvoie les littéraux de la clause i (tranche d'array), sans
+    objet Python par littéral ni par clause.
+    """
+
+    __slots__ = ("lits", "offsets", "num_vars")
+
+    def __init__(self, clauses=()):
+        self.lits = array("i")
+        self.offsets = array("q", [0])
+        self.num_vars = 0
+        for clause in clauses:
+            self.append(clause)
+
+    def append(self, clause):
+        self.lits.extend(clause)
+        start = self.offsets[-1]
+        for lit in self.lits[start:]:
+            if abs(lit) > self.num_vars:
+                self.num_vars = abs(lit)
+        self.offsets.append(len(self.lits))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.lits[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        lits, offsets = self.lits, self.offsets
+        for i in range(len(offsets) - 1):
+            yield lits[offsets[i]:offsets[i + 1]]
+
+
+def _open(path, mode):
+    for ext, opener in _OPENERS.items():
+        if path.endswith(ext):
+            return opener(path, mode + "t", encoding="ascii")
+    return open(path, mode, encoding="ascii")
+
+
+def read_dimacs(source):
+    """Lit un fichier CNF DIMACS (chemin, éventuellement .gz/.bz2/.xz, ou
+    fichier texte ouvert) ligne par ligne dans un ClauseStore.
+
+    Les clauses peuvent s'étendre sur plusieurs lignes ; les commentaires
+    (c ...) et la ligne d'en-tête (p cnf ...) sont ignorés, sauf pour le
+    nombre de variables déclaré.
+    """
+    if isinstance(source, str):
+        with _open(source, "r") as f:
+            return read_dimacs(f)
+    store = ClauseStore()
+    lits, offsets = store.lits, store.offsets
+    declared = 0
+    top = 0
+    for line in source:
+        head = line[:1]
+        if head == "c" or head == "\n" or not line.strip():
+            continue
+        if head == "p":
+            fields = line.split()
+            if len(fields) < 4 or fields[1] != "cnf":
+                raise ValueError(f"en-tête DIMACS invalide : {line.strip()}")
+            declared = int(fields[2])
+            continue
+        if head == "%":
+            break
+        for lit in map(int, line.split()):
+            if lit == 0:
+                offsets.append(len(lits))
+            else:
+                lits.append(lit)
+                if lit > top:
+                    top = lit
+                elif -lit > top:
+                    top = -lit
+    if offsets[-1] != len(lits):
+        offsets.append(len(lits))
+    store.num_vars = max(declared, top)
+    return store
+
+
+def write_dimacs(clauses, target, num_vars=None, comments=()):
+    """Écrit des clauses (ClauseStore ou itérable de listes d'entiers) au format DIMACS."""
+    if isinstance(target, str):
+        with _open(target, "w") as f:
+            return write_dimacs(clauses, f, num_vars, comments)
+    if not isinstance(clauses, ClauseStore):
+        clauses = ClauseStore(clauses)
+    if num_vars is None:
+        num_vars = clauses.num_vars
+    for comment in comments:
+        target.write(f"c {comment}\n")
+    target.write(f"p cnf {num_vars} {len(clauses)}\n")
+    for clause in clauses:
+        target.write(" ".join(map(str, clause)))
+        target.write(" 0\n" if len(clause) else "0\n")
+
+
+def from_notation(clause_strs, variables=None):
+    """Convertit des clauses écrites "(A ∨ ¬B)" en ClauseStore.
+
+    Renvoie (store, noms) où noms[v - 1] est le nom de la variable v.
+    """
+    names = list(variables) if variables is not None else []
+    ids = {name: i + 1 for i, name in enumerate(names)}
+    store = ClauseStore()
+    for clause_str in clause_strs:
+        clause = []
+        for token in clause_str.translate(_NOTATION).split():
+            negative = token.startswith("¬")
+            name = token[1:] if negative else token
+            v = ids.get(name)
+            if v is None:
+                names.append(name)
+                v = ids[name] = len(names)
+            clause.append(-v if negative else v)
+        store.append(clause)
+    store.num_vars = max(store.num_vars, len(names))
+    return store, names
@@ -1,3 +1,10 @@
+import heapq
+import multiprocessing
+import os
+import queue
+import random
+import time
+
 def parse_clause(clause_str):
     literals = []
     tokens = clause_str.replace('(', '').replace(')', '').replace('∨', ' ').split()
@@ -37,4 +44,569 @@ def solve_sat_backtrack(clauses, variables, assignment=None, var_index=0):
             return True
     
     del assignment[var]
-    return False
\ No newline at end of file
+    return False
+
+def luby(i):
+    """i-ème terme (à partir de 1) de la suite de Luby : 1 1 2 1 1 2 4 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+class CDCLSolver:
+    """Solveur SAT CDCL (conflict-driven clause learning).
+
+    Les littéraux suivent la convention DIMACS : la variable v (v >= 1) est
+    le littéral v et sa négation -v. En interne, le littéral est codé 2v
+    (positif) ou 2v + 1 (négatif), donc l ^ 1 est sa négation.
+
+    Propagation par deux littéraux surveillés, choix de variable VSIDS avec
+    mémorisation de phase, apprentissage de clause au premier UIP,
+    redémarrages selon la suite de Luby et suppression périodique des
+    clauses apprises de plus grand LBD.
+
+    Pour le mode portfolio, `on_learn` (si défini) reçoit chaque clause
+    apprise en littéraux DIMACS, et `incoming` (si défini) est appelé à
+    chaque redémarrage et renvoie des clauses à ajouter.
+    """
+
+    def __init__(self, clauses=(), seed=0, var_decay=0.95, restart_base=100,
+                 random_freq=0.0, default_phase=False):
+        self.rng = random.Random(seed)
+        self.var_decay = var_decay
+        self.restart_base = restart_base
+        self.random_freq = random_freq
+        self.default_phase = default_phase
+        self.num_vars = 0
+        self.clauses = []
+        self.learnts = []
+        self.lbd = {}
+        self.watches = [[], []]
+        self.value = [0, 0]
+        self.level = [0]
+        self.reason = [-1]
+        self.activity = [0.0]
+        self.phase = [default_phase]
+        self.seen = bytearray(1)
+        self.heap = []
+        self.var_inc = 1.0
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.unsat = False
+        self.max_learnts = 0
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self._model = None
+        self._core = None
+        self.on_learn = None
+        self.incoming = None
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def new_var(self):
+        self.num_vars += 1
+        self.watches += [[], []]
+        self.value += [0, 0]
+        self.level.append(0)
+        self.reason.append(-1)
+        self.activity.append(0.0)
+        self.phase.append(self.default_phase)
+        self.seen.append(0)
+        heapq.heappush(self.heap, (0.0, self.num_vars))
+        return self.num_vars
+
+    def _lit(self, lit):
+        v = abs(lit)
+        if v == 0:
+            raise ValueError("0 n'est pas un littéral")
+        while self.num_vars < v:
+            self.new_var()
+        return 2 * v + (lit < 0)
+
+    @staticmethod
+    def _dimacs(lit):
+        return -(lit >> 1) if lit & 1 else lit >> 1
+
+    def add_clause(self, lits):
+        """Ajoute une clause (itérable de littéraux DIMACS) ; renvoie False si
+        la formule devient trivialement insatisfiable."""
+        if self.unsat:
+            return False
+        self._cancel_until(0)
+        clause = []
+        for lit in lits:
+            lit = self._lit(lit)
+            if lit ^ 1 in clause or self.value[lit] == 1:
+                return True
+            if lit not in clause and self.value[lit] == 0:
+                clause.append(lit)
+        if not clause:
+            self.unsat = True
+            return False
+        if len(clause) == 1:
+            self._enqueue(clause[0], -1)
+            if self._propagate() is not None:
+                self.unsat = True
+                return False
+            return True
+        self._attach(clause)
+        return True
+
+    def _attach(self, clause):
+        ci = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(ci)
+        self.watches[clause[1]].append(ci)
+        return ci
+
+    def _enqueue(self, lit, reason):
+        v = lit >> 1
+        self.value[lit] = 1
+        self.value[lit ^ 1] = -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        clauses, watches, value = self.clauses, self.watches, self.value
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            ws = watches[false_lit]
+            i = j = 0
+            end = len(ws)
+            while i < end:
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+                if c is None:
+                    continue
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], false_lit
+                first = c[0]
+                if value[first] == 1:
+                    ws[j] = ci
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    if value[c[k]] != -1:
+                        c[1], c[k] = c[k], false_lit
+                        watches[c[1]].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+                    if value[first] == -1:
+                        while i < end:
+                            ws[j] = ws[i]
+                            i += 1
+                            j += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return ci
+                    self._enqueue(first, ci)
+            del ws[j:]
+        return None
+
+    def _cancel_until(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        value, phase, heap, activity = self.value, self.phase, self.heap, self.activity
+        stop = self.trail_lim[level]
+        for k in range(len(self.trail) - 1, stop - 1, -1):
+            lit = self.trail[k]
+            v = lit >> 1
+            value[lit] = value[lit ^ 1] = 0
+            self.reason[v] = -1
+            phase[v] = not (lit & 1)
+            heapq.heappush(heap, (-activity[v], v))
+        del self.trail[stop:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _bump(self, v):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[u], u) for u in range(1, self.num_vars + 1) if self.value[2 * u] == 0]
+            heapq.heapify(self.heap)
+        elif self.value[2 * v] == 0:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def _analyze(self, confl):
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        counter = 0
+        p = -1
+        idx = len(trail) - 1
+        while True:
+            c = self.clauses[confl]
+            for q in (c if p < 0 else c[1:]):
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = 1
+                    self._bump(v)
+                    if level[v] >= current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            confl = reason[p >> 1]
+            seen[p >> 1] = 0
+            counter -= 1
+            if counter == 0:
+                break
+        learnt[0] = p ^ 1
+        # minimisation : q est redondant si sa raison est couverte par la clause
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r < 0 or any(not seen[x >> 1] and level[x >> 1] > 0 for x in self.clauses[r][1:]):
+                kept.append(q)
+        for q in learnt:
+            seen[q >> 1] = 0
+        learnt = kept
+        back = 0
+        if len(learnt) > 1:
+            best = max(range(1, len(learnt)), key=lambda k: level[learnt[k] >> 1])
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            back = level[learnt[1] >> 1]
+        return learnt, back
+
+    def _pick_branch(self):
+        value = self.value
+        if self.random_freq and self.rng.random() < self.random_freq:
+            v = self.rng.randint(1, self.num_vars)
+            if value[2 * v] == 0:
+                return v
+        heap, activity = self.heap, self.activity
+        if len(heap) > 8 * self.num_vars + 64:
+            self.heap = heap = [(-activity[u], u) for u in range(1, self.num_vars + 1) if value[2 * u] == 0]
+            heapq.heapify(heap)
+        while heap:
+            act, v = heapq.heappop(heap)
+            if value[2 * v] == 0 and -act == activity[v]:
+                return v
+        for v in range(1, self.num_vars + 1):
+            if value[2 * v] == 0:
+                return v
+        return 0
+
+    def _locked(self, ci):
+        c = self.clauses[ci]
+        return self.reason[c[0] >> 1] == ci and self.value[c[0]] == 1
+
+    def _reduce_db(self):
+        # on garde les clauses binaires, celles de LBD <= 2 et celles servant de raison
+        lbd = self.lbd
+        self.learnts.sort(key=lambda ci: (lbd[ci], len(self.clauses[ci])))
+        half = len(self.learnts) // 2
+        kept = self.learnts[:half]
+        for ci in self.learnts[half:]:
+            if len(self.clauses[ci]) <= 2 or lbd[ci] <= 2 or self._locked(ci):
+                kept.append(ci)
+            else:
+                self.clauses[ci] = None
+                del lbd[ci]
+        self.learnts = kept
+
+    def _learn(self, learnt):
+        if self.on_learn is not None:
+            self.on_learn([self._dimacs(q) for q in learnt])
+        if len(learnt) == 1:
+            self._enqueue(learnt[0], -1)
+            return
+        ci = self._attach(learnt)
+        self.learnts.append(ci)
+        self.lbd[ci] = len({self.level[q >> 1] for q in learnt})
+        self._enqueue(learnt[0], ci)
+
+    def _analyze_final(self, p):
+        # p est une hypothèse devenue fausse : on remonte ses raisons jusqu'aux
+        # hypothèses (décisions) qui l'ont falsifiée
+        core = [p]
+        v = p >> 1
+        if self.level[v] == 0:
+            return core
+        seen, reason, level, trail = self.seen, self.reason, self.level, self.trail
+        seen[v] = 1
+        for k in range(len(trail) - 1, self.trail_lim[0] - 1, -1):
+            q = trail[k]
+            x = q >> 1
+            if not seen[x]:
+                continue
+            r = reason[x]
+            if r < 0:
+                core.append(q)
+            else:
+                for y in self.clauses[r][1:]:
+                    if level[y >> 1] > 0:
+                        seen[y >> 1] = 1
+            seen[x] = 0
+        return core
+
+    def solve(self, assumptions=()):
+        """Renvoie True si la formule est satisfiable (modèle via model()).
+
+        `assumptions` est une liste de littéraux DIMACS supposés vrais pour
+        cet appel seulement ; en cas d'échec, core() donne le sous-ensemble
+        des hypothèses responsable. Les clauses apprises sont conservées
+        d'un appel à l'autre.
+        """
+        self._model = None
+        self._core = None
+        assumptions = [self._lit(lit) for lit in assumptions]
+        if self.unsat:
+            self._core = []
+            return False
+        self._cancel_until(0)
+        if self._propagate() is not None:
+            self.unsat = True
+            self._core = []
+            return False
+        value = self.value
+        if not self.max_learnts:
+            self.max_learnts = max(len(self.clauses) // 3, 2000)
+        restarts = 1
+        budget = luby(restarts) * self.restart_base
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                self.conflicts += 1
+                budget -= 1
+                if not self.trail_lim:
+                    self.unsat = True
+                    self._core = []
+                    return False
+                learnt, back = self._analyze(confl)
+                self._cancel_until(back)
+                self._learn(learnt)
+                self.var_inc /= self.var_decay
+                continue
+            if budget <= 0:
+                restarts += 1
+                budget = luby(restarts) * self.restart_base
+                self._cancel_until(0)
+                if self.incoming is not None:
+                    for clause in self.incoming():
+                        if not self.add_clause(clause):
+                            self._core = []
+                            return False
+                continue
+            level = len(self.trail_lim)
+            if level < len(assumptions):
+                p = assumptions[level]
+                if value[p] == -1:
+                    self._core = [self._dimacs(q) for q in self._analyze_final(p)]
+                    return False
+                # un niveau par hypothèse, même vide, pour garder l'indexation
+                self.trail_lim.append(len(self.trail))
+                if value[p] == 0:
+                    self._enqueue(p, -1)
+                continue
+            if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                self._reduce_db()
+                self.max_learnts = int(self.max_learnts * 1.1)
+            v = self._pick_branch()
+            if not v:
+                self._model = [None] + [self.value[2 * u] == 1 for u in range(1, self.num_vars + 1)]
+                return True
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(2 * v + (not self.phase[v]), -1)
+
+    def model(self):
+        """Modèle trouvé par le dernier solve() : {variable: booléen}."""
+        if self._model is None:
+            return None
+        return {v: self._model[v] for v in range(1, len(self._model))}
+
+    def core(self):
+        """Hypothèses responsables du dernier échec de solve() (littéraux
+        DIMACS) ; liste vide si la formule est insatisfiable sans elles."""
+        return None if self._core is None else list(self._core)
+
+    def enumerate_models(self, limit=None, variables=None, assumptions=()):
+        """Générateur des modèles distincts sur `variables` (par défaut
+        toutes les variables existantes), au plus `limit`.
+
+        Chaque modèle est exclu par une clause de blocage gardée par une
+        variable d'activation : une fois le générateur terminé, ces clauses
+        sont désactivées et le solveur peut resservir pour d'autres requêtes
+        en conservant ses clauses apprises.
+        """
+        if variables is None:
+            variables = range(1, self.num_vars + 1)
+        variables = [self._lit(v) >> 1 for v in variables]
+        selector = self.new_var()
+        found = 0
+        try:
+            while limit is None or found < limit:
+                if not self.solve(list(assumptions) + [-selector]):
+                    return
+                model = self._model
+                found += 1
+                yield {v: model[v] for v in variables}
+                self.add_clause([-v if model[v] else v for v in variables] + [selector])
+        finally:
+            self.add_clause([selector])
+
+PORTFOLIO_DECAYS = (0.95, 0.85, 0.99, 0.9)
+PORTFOLIO_RESTARTS = (100, 50, 300, 1000)
+# intervalle (s) entre deux vérifications de l'état des processus du portfolio
+PORTFOLIO_POLL = 0.1
+
+def portfolio_configs(n):
+    """n réglages différents de CDCLSolver (graine, décroissance VSIDS,
+    fréquence des redémarrages, phase par défaut, choix aléatoires)."""
+    return [
+        {
+            "seed": i,
+            "var_decay": PORTFOLIO_DECAYS[i % len(PORTFOLIO_DECAYS)],
+            "restart_base": PORTFOLIO_RESTARTS[(i // 2) % len(PORTFOLIO_RESTARTS)],
+            "default_phase": bool(i % 2),
+            "random_freq": 0.0 if i < 4 else 0.02,
+        }
+        for i in range(n)
+    ]
+
+def _portfolio_worker(index, clauses, config, results, inboxes, share_size):
+    try:
+        sat, model = _portfolio_solve(index, clauses, config, inboxes, share_size)
+    except Exception as exc:
+        results.put((index, None, None, exc))
+    else:
+        results.put((index, sat, model, None))
+
+def _portfolio_solve(index, clauses, config, inboxes, share_size):
+    solver = CDCLSolver(clauses, **config)
+    if inboxes is not None:
+        for q in inboxes:
+            # un processus arrêté ne doit pas attendre la vidange de ses envois
+            q.cancel_join_thread()
+        inbox = inboxes[index]
+        others = [q for k, q in enumerate(inboxes) if k != index]
+
+        def export(lits):
+            if len(lits) <= share_size:
+                for q in others:
+                    q.put(lits)
+
+        def incoming():
+            received = []
+            while True:
+                try:
+                    received.append(inbox.get_nowait())
+                except queue.Empty:
+                    return received
+
+        solver.on_learn = export
+        solver.incoming = incoming
+    sat = solver.solve()
+    return sat, solver.model() if sat else None
+
+def solve_portfolio(clauses, workers=None, configs=None, share_size=8, timeout=None):
+    """Lance plusieurs CDCLSolver configurés différemment dans des processus
+    et renvoie le premier résultat : (True, modèle), (False, None), ou
+    (None, None) si `timeout` secondes s'écoulent sans réponse.
+
+    `clauses` contient des clauses DIMACS (ou un ClauseStore). Les clauses
+    apprises d'au plus `share_size` littéraux sont transmises aux autres
+    processus, qui les intègrent à leur prochain redémarrage (share_size=0
+    pour désactiver le partage). Les processus restants sont arrêtés dès
+    la première réponse. Si tous les processus échouent (exception ou arrêt
+    brutal), l'erreur du premier est relevée.
+    """
+    if configs is None:
+        configs = portfolio_configs(workers or os.cpu_count() or 1)
+    if len(configs) == 1:
+        solver = CDCLSolver(clauses, **configs[0])
+        sat = solver.solve()
+        return sat, solver.model() if sat else None
+    results = multiprocessing.Queue()
+    inboxes = [multiprocessing.Queue() for _ in configs] if share_size > 0 else None
+    procs = [
+        multiprocessing.Process(
+            target=_portfolio_worker,
+            args=(i, clauses, config, results, inboxes, share_size),
+            daemon=True,
+        )
+        for i, config in enumerate(configs)
+    ]
+    for proc in procs:
+        proc.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    errors = {}
+    try:
+        while len(errors) < len(procs):
+            wait = PORTFOLIO_POLL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return None, None
+            try:
+                index, sat, model, error = results.get(timeout=wait)
+            except queue.Empty:
+                # un processus mort sans rien envoyer (mémoire, signal,
+                # résultat impossible à sérialiser) compte comme un échec
+                dead = [i for i, proc in enumerate(procs) if proc.exitcode is not None and i not in errors]
+                if dead and len(errors) + len(dead) == len(procs):
+                    try:
+                        index, sat, model, error = results.get(timeout=PORTFOLIO_POLL)
+                    except queue.Empty:
+                        for i in dead:
+                            errors[i] = RuntimeError(
+                                f"le processus {i} du portfolio s'est arrêté (code {procs[i].exitcode})"
+                            )
+                        continue
+                else:
+                    continue
+            if error is None:
+                return sat, model
+            errors[index] = error
+        raise errors[min(errors)]
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.join()
+        for q in [results] + (inboxes or []):
+            q.cancel_join_thread()
+            q.close()
+
+def solve_sat_cdcl(clauses, variables=None):
+    """Résout des clauses au format de parse_clause avec le solveur CDCL.
+
+    Renvoie une assignation {nom: booléen} satisfaisante, ou None.
+    """
+    names = list(variables) if variables is not None else []
+    ids = {name: i + 1 for i, name in enumerate(names)}
+    solver = CDCLSolver()
+    for clause in clauses:
+        lits = []
+        for name, positive in clause:
+            if name not in ids:
+                names.append(name)
+                ids[name] = len(names)
+            lits.append(ids[name] if positive else -ids[name])
+        solver.add_clause(lits)
+    for _ in range(solver.num_vars, len(names)):
+        solver.new_var()
+    if not solver.solve():
+        return None
+    model = solver.model()
+    return {name: model[ids[name]] for name in names}
@@ -1,4 +1,170 @@
-def nearest_neighbor_tsp(distances, start=0):
+import heapq
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# au-delà, la table de Held-Karp (2^(n-1) x (n-1) flottants) devient trop grosse
+HELD_KARP_LIMIT = 20
+# nombre de lignes de la table traitées à la fois par la version NumPy
+HELD_KARP_CHUNK = 1 << 16
+# taille des listes de voisins candidats pour la recherche locale
+CANDIDATES = 8
+# gain minimal pour accepter un mouvement (distances flottantes)
+EPSILON = 1e-10
+# nombre maximal de villes par feuille de l'arbre k-d
+KD_LEAF_SIZE = 8
+# nombre visé de sous-arbres (préfixes de tour) par processus en mode parallèle
+TASKS_PER_WORKER = 16
+
+# état du branch and bound dans chaque processus de travail
+_worker = {}
+
+class _KDTree:
+    """Index spatial : arbre k-d sur les villes, avec suppression.
+
+    Chaque nœud couvre une tranche de `perm`, coupée à la médiane selon
+    l'axe le plus étendu jusqu'à des feuilles d'au plus KD_LEAF_SIZE villes.
+    Contrairement à une grille uniforme, la profondeur ne dépend pas de la
+    répartition des villes (amas compris). Chaque nœud compte ses villes
+    encore présentes : les sous-arbres vidés par `remove` sont ignorés.
+    """
+
+    def __init__(self, xs, ys, ids):
+        self.xs, self.ys = xs, ys
+        self.perm = perm = list(ids)
+        self.present = bytearray(len(xs))
+        self.leaf = [-1] * len(xs)
+        self.lo, self.hi, self.axis, self.split = [], [], [], []
+        self.left, self.right, self.parent, self.alive = [], [], [], []
+        stack = [(-1, 0, len(perm), False)]
+        while stack:
+            parent, lo, hi, is_right = stack.pop()
+            node = len(self.lo)
+            self.lo.append(lo)
+            self.hi.append(hi)
+            self.parent.append(parent)
+            self.alive.append(hi - lo)
+            self.left.append(-1)
+            self.right.append(-1)
+            self.axis.append(0)
+            self.split.append(0.0)
+            if parent >= 0:
+                (self.right if is_right else self.left)[parent] = node
+            part = perm[lo:hi]
+            if hi - lo <= KD_LEAF_SIZE:
+                for i in part:
+                    self.present[i] = 1
+                    self.leaf[i] = node
+                continue
+            px = [xs[i] for i in part]
+            py = [ys[i] for i in part]
+            axis = 0 if max(px) - min(px) >= max(py) - min(py) else 1
+            coord = xs if axis == 0 else ys
+            part.sort(key=coord.__getitem__)
+            perm[lo:hi] = part
+            mid = (lo + hi) // 2
+            self.axis[node] = axis
+            self.split[node] = coord[perm[mid]]
+            stack.append((node, mid, hi, True))
+            stack.append((node, lo, mid, False))
+
+    @property
+    def count(self):
+        return self.alive[0] if self.alive else 0
+
+    def remove(self, i):
+        if not self.present[i]:
+            return
+        self.present[i] = 0
+        alive, parent = self.alive, self.parent
+        node = self.leaf[i]
+        while node >= 0:
+            alive[node] -= 1
+            node = parent[node]
+
+    def nearest(self, x, y, k=1, exclude=-1):
+        """Les k villes les plus proches de (x, y) : [(distance, ville)] trié."""
+        xs, ys, perm, present = self.xs, self.ys, self.perm, self.present
+        lo, hi, axis, split = self.lo, self.hi, self.axis, self.split
+        left, right, alive = self.left, self.right, self.alive
+        # tas max des k meilleures : (-distance², -ville)
+        best = []
+        stack = [(0, 0.0)] if alive else []
+        while stack:
+            node, bound = stack.pop()
+            if not alive[node] or (len(best) == k and bound > -best[0][0]):
+                continue
+            if left[node] < 0:
+                for i in perm[lo[node]:hi[node]]:
+                    if present[i] and i != exclude:
+                        dx = xs[i] - x
+                        dy = ys[i] - y
+                        item = (-(dx * dx + dy * dy), -i)
+                        if len(best) < k:
+                            heapq.heappush(best, item)
+                        elif item > best[0]:
+                            heapq.heapreplace(best, item)
+                continue
+            diff = (x if axis[node] == 0 else y) - split[node]
+            near, far = (left[node], right[node]) if diff < 0 else (right[node], left[node])
+            # toute ville de l'autre côté est à au moins |diff| du point
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        return sorted((math.sqrt(-d2), -i) for d2, i in best)
+
+def _split_coords(coords):
+    if np is not None and isinstance(coords, np.ndarray):
+        return coords[:, 0].tolist(), coords[:, 1].tolist()
+    return [float(c[0]) for c in coords], [float(c[1]) for c in coords]
+
+def _euclidean_length(xs, ys, path):
+    return sum(math.hypot(xs[a] - xs[b], ys[a] - ys[b]) for a, b in zip(path, path[1:]))
+
+def _nearest_neighbor_coords(coords, start):
+    xs, ys = _split_coords(coords)
+    n = len(xs)
+    tree = _KDTree(xs, ys, range(n))
+    tree.remove(start)
+    path = [start]
+    current = start
+    for _ in range(n - 1):
+        _, current = tree.nearest(xs[current], ys[current])[0]
+        tree.remove(current)
+        path.append(current)
+    path.append(start)
+    return path, _euclidean_length(xs, ys, path)
+
+def nearest_neighbor_tsp(distances, start=0, coords=None):
+    """Heuristique du plus proche voisin : (chemin, distance).
+
+    Avec `coords` (liste de points (x, y) ou tableau n x 2) au lieu de la
+    matrice (`distances=None`), les distances euclidiennes sont calculées à
+    la volée et le plus proche voisin non visité est cherché dans un arbre
+    k-d : aucune matrice n x n n'est construite. Avec une matrice et
+    NumPy, chaque étape est un argmin masqué sur la ligne courante.
+    """
+    if coords is not None:
+        return _nearest_neighbor_coords(coords, start)
+    if np is not None and len(distances) > 1:
+        d = np.asarray(distances, dtype=np.float64)
+        visited = np.zeros(len(d), dtype=bool)
+        visited[start] = True
+        path = [start]
+        current = start
+        for _ in range(len(d) - 1):
+            current = int(np.argmin(np.where(visited, np.inf, d[current])))
+            visited[current] = True
+            path.append(current)
+        path.append(start)
+        return path, tour_length(distances, path)
     n = len(distances)
     unvisited = set(range(n))
     path = [start]
@@ -43,4 +209,484 @@ def brute_force_tsp(distances):
             min_distance = distance
             best_path = path
     
-    return best_path, min_distance
\ No newline at end of file
+    return best_path, min_distance
+
+def tour_length(distances, path):
+    total = 0
+    for i in range(len(path) - 1):
+        total += distances[path[i]][path[i + 1]]
+    return total
+
+def _held_karp_numpy(distances):
+    n = len(distances)
+    m = n - 1
+    d = np.asarray(distances, dtype=np.float64)
+    # dp[mask, j] : plus court chemin partant de 0, visitant les villes du
+    # masque (bit j = ville j + 1) et finissant en j + 1
+    dp = np.full((1 << m, m), np.inf)
+    cols = np.arange(m)
+    dp[1 << cols, cols] = d[0, 1:]
+    masks = np.arange(1 << m, dtype=np.int64)
+    popcount = np.zeros(1 << m, dtype=np.int8)
+    for j in range(m):
+        popcount += ((masks >> j) & 1).astype(np.int8)
+    for k in range(2, m + 1):
+        layer = masks[popcount == k]
+        for j in range(m):
+            with_j = layer[(layer >> j) & 1 == 1]
+            into_j = d[1:, j + 1]
+            for lo in range(0, len(with_j), HELD_KARP_CHUNK):
+                chunk = with_j[lo:lo + HELD_KARP_CHUNK]
+                dp[chunk, j] = (dp[chunk ^ (1 << j)] + into_j).min(axis=1)
+    full = (1 << m) - 1
+    j = int(np.argmin(dp[full] + d[1:, 0]))
+    path = [j + 1]
+    mask = full
+    while mask != 1 << j:
+        mask ^= 1 << j
+        j = int(np.argmin(dp[mask] + d[1:, j + 1]))
+        path.append(j + 1)
+    return [0] + path[::-1] + [0]
+
+def _held_karp_python(distances):
+    n = len(distances)
+    m = n - 1
+    inf = float("inf")
+    dp = [[inf] * m for _ in range(1 << m)]
+    for j in range(m):
+        dp[1 << j][j] = distances[0][j + 1]
+    for mask in range(1, 1 << m):
+        row = dp[mask]
+        for j in range(m):
+            if not mask >> j & 1 or row[j] == inf:
+                continue
+            base = row[j]
+            out = distances[j + 1]
+            for k in range(m):
+                if not mask >> k & 1:
+                    nxt = dp[mask | 1 << k]
+                    if base + out[k + 1] < nxt[k]:
+                        nxt[k] = base + out[k + 1]
+    full = (1 << m) - 1
+
+    def best_before(mask, target):
+        row = dp[mask]
+        return min(range(m), key=lambda i: row[i] + distances[i + 1][target])
+
+    j = best_before(full, 0)
+    path = [j + 1]
+    mask = full
+    while mask != 1 << j:
+        mask ^= 1 << j
+        j = best_before(mask, j + 1)
+        path.append(j + 1)
+    return [0] + path[::-1] + [0]
+
+def held_karp_tsp(distances):
+    """TSP exact par programmation dynamique sur les sous-ensembles
+    (Held-Karp), en O(n² 2^n) temps et O(n 2^n) mémoire.
+
+    Avec NumPy, chaque couche de sous-ensembles de même cardinal est
+    traitée d'un bloc ; sinon on utilise une version Python pure.
+    Renvoie (chemin, distance), le chemin partant et revenant en 0.
+    Lève ValueError au-delà de HELD_KARP_LIMIT villes, avant d'allouer la
+    table.
+    """
+    n = len(distances)
+    if n > HELD_KARP_LIMIT:
+        raise ValueError(
+            f"Held-Karp limité à {HELD_KARP_LIMIT} villes ({n} demandées) : "
+            "utiliser branch_and_bound_tsp"
+        )
+    if n <= 2:
+        path = list(range(n)) + [0]
+        return path, tour_length(distances, path)
+    path = _held_karp_numpy(distances) if np is not None else _held_karp_python(distances)
+    return path, tour_length(distances, path)
+
+class _BranchAndBound:
+    """Recherche en profondeur sur les tours partiels partant de 0.
+
+    Borne inférieure d'un tour partiel 0 -> ... -> u (villes restantes R) :
+    coût courant + arbre couvrant minimum de R + arête la moins chère de u
+    vers R + arête la moins chère de R vers 0 (arbre 1-couvrant), avec des
+    poids symétrisés min(d[i][j], d[j][i]) pour rester valide si la matrice
+    n'est pas symétrique. Les arbres couvrants sont mémorisés par masque.
+    """
+
+    def __init__(self, distances, best_path, best_cost):
+        self.d = distances
+        self.n = len(distances)
+        n = self.n
+        self.sym = [[min(distances[i][j], distances[j][i]) for j in range(n)] for i in range(n)]
+        self.order = [sorted((v for v in range(n) if v != u), key=lambda v: distances[u][v]) for u in range(n)]
+        self.best_path = best_path
+        self.best_cost = best_cost
+        self.mst_cache = {}
+        self.nodes = 0
+
+    def _mst(self, mask):
+        weight = self.mst_cache.get(mask)
+        if weight is not None:
+            return weight
+        cities = [v for v in range(self.n) if mask >> v & 1]
+        weight = 0
+        if len(cities) > 1:
+            # Prim en O(k²)
+            sym = self.sym
+            first = cities[0]
+            key = {v: sym[first][v] for v in cities[1:]}
+            while key:
+                v = min(key, key=key.get)
+                weight += key.pop(v)
+                row = sym[v]
+                for u in key:
+                    if row[u] < key[u]:
+                        key[u] = row[u]
+        self.mst_cache[mask] = weight
+        return weight
+
+    def bound(self, last, remaining, cost):
+        if not remaining:
+            return cost + self.d[last][0]
+        d = self.d
+        out = min(d[last][v] for v in range(self.n) if remaining >> v & 1)
+        back = min(d[v][0] for v in range(self.n) if remaining >> v & 1)
+        return cost + out + back + self._mst(remaining)
+
+    def search(self, path, remaining, cost):
+        self.nodes += 1
+        last = path[-1]
+        if not remaining:
+            total = cost + self.d[last][0]
+            if total < self.best_cost:
+                self.best_cost = total
+                self.best_path = path + [0]
+            return
+        row = self.d[last]
+        for v in self.order[last]:
+            if not remaining >> v & 1:
+                continue
+            rest = remaining & ~(1 << v)
+            c = cost + row[v]
+            if self.bound(v, rest, c) < self.best_cost:
+                path.append(v)
+                self.search(path, rest, c)
+                path.pop()
+
+    def search_shared(self, path, remaining, cost, shared):
+        # variante parallèle : on n'élague que ce qui est strictement pire que
+        # la meilleure distance partagée, et ce qui n'améliore pas strictement
+        # le meilleur tour local ; le résultat ne dépend donc pas de l'ordre
+        # dans lequel les processus trouvent leurs tours
+        self.nodes += 1
+        last = path[-1]
+        if not remaining:
+            total = cost + self.d[last][0]
+            if total < self.best_cost:
+                self.best_cost = total
+                self.best_path = path + [0]
+                with shared.get_lock():
+                    if total < shared.value:
+                        shared.value = total
+            return
+        row = self.d[last]
+        for v in self.order[last]:
+            if not remaining >> v & 1:
+                continue
+            rest = remaining & ~(1 << v)
+            c = cost + row[v]
+            b = self.bound(v, rest, c)
+            if b < self.best_cost and b <= shared.value:
+                path.append(v)
+                self.search_shared(path, rest, c, shared)
+                path.pop()
+
+def _initial_tour(distances):
+    n = len(distances)
+    initial, _ = nearest_neighbor_tsp(distances, 0)
+    if all(distances[i][j] == distances[j][i] for i in range(n) for j in range(i)):
+        initial, _ = improve_tour(distances, initial)
+    return initial
+
+def branch_and_bound_tsp(distances, initial=None):
+    """TSP exact par séparation et évaluation (branch and bound).
+
+    La meilleure solution connue part du tour `initial` (chemin fermé), par
+    défaut celui de nearest_neighbor_tsp amélioré par improve_tour (si la
+    matrice est symétrique) ; les branches dont la borne par
+    arbre 1-couvrant n'est pas strictement meilleure sont élaguées.
+    Renvoie (chemin, distance), le chemin partant et revenant en 0.
+    """
+    n = len(distances)
+    if n <= 2:
+        path = list(range(n)) + [0]
+        return path, tour_length(distances, path)
+    if initial is None:
+        initial = _initial_tour(distances)
+    best = _BranchAndBound(distances, list(initial), tour_length(distances, initial))
+    best.search([0], ((1 << n) - 1) & ~1, 0)
+    return best.best_path, tour_length(distances, best.best_path)
+
+def _candidate_lists_coords(xs, ys, k):
+    tree = _KDTree(xs, ys, range(len(xs)))
+    return [[i for _, i in tree.nearest(xs[c], ys[c], k, exclude=c)] for c in range(len(xs))]
+
+def _candidate_lists(distances, k):
+    n = len(distances)
+    k = min(k, n - 1)
+    if np is not None:
+        d = np.asarray(distances, dtype=np.float64).copy()
+        np.fill_diagonal(d, np.inf)
+        near = np.argpartition(d, k - 1, axis=1)[:, :k]
+        rows = np.take_along_axis(d, near, axis=1)
+        return np.take_along_axis(near, np.argsort(rows, axis=1, kind="stable"), axis=1).tolist()
+    return [sorted((j for j in range(n) if j != i), key=distances[i].__getitem__)[:k] for i in range(n)]
+
+class _LocalSearch:
+    """Tour stocké dans un tableau (tour, pos) : succ/pred en O(1), et un
+    2-opt inverse le plus court des deux segments concernés."""
+
+    def __init__(self, dist, tour, candidates):
+        self.dist = dist
+        self.tour = tour
+        self.n = len(tour)
+        self.pos = [0] * self.n
+        for i, city in enumerate(tour):
+            self.pos[city] = i
+        self.cand = candidates
+        self.queue = deque(tour)
+        self.active = bytearray(b"\x01") * self.n
+
+    def succ(self, city):
+        i = self.pos[city] + 1
+        return self.tour[i if i < self.n else 0]
+
+    def pred(self, city):
+        return self.tour[self.pos[city] - 1]
+
+    def activate(self, *cities):
+        for city in cities:
+            if not self.active[city]:
+                self.active[city] = 1
+                self.queue.append(city)
+
+    def _reverse(self, i, j):
+        tour, pos, n = self.tour, self.pos, self.n
+        for _ in range(((j - i) % n + 1) // 2):
+            a, b = tour[i], tour[j]
+            tour[i] = b
+            pos[b] = i
+            tour[j] = a
+            pos[a] = j
+            i = i + 1 if i + 1 < n else 0
+            j = j - 1 if j > 0 else n - 1
+
+    def exchange(self, x1, x2, y1, y2):
+        # retire les arêtes (x1, x2) et (y1, y2), ajoute (x1, y1) et (x2, y2)
+        if self.succ(x1) == x2:
+            a, b, c, d = x1, x2, y1, y2
+        else:
+            a, b, c, d = x2, x1, y2, y1
+        pos = self.pos
+        if ((pos[c] - pos[b]) % self.n + 1) * 2 <= self.n:
+            self._reverse(pos[b], pos[c])
+        else:
+            self._reverse(pos[d], pos[a])
+
+    def two_opt(self, a):
+        dist = self.dist
+        for forward in (True, False):
+            b = self.succ(a) if forward else self.pred(a)
+            d_ab = dist(a, b)
+            for c in self.cand[a]:
+                g = d_ab - dist(a, c)
+                if g <= EPSILON:
+                    break
+                d = self.succ(c) if forward else self.pred(c)
+                if c == b or d == a:
+                    continue
+                if g + dist(c, d) - dist(b, d) > EPSILON:
+                    self.exchange(a, b, c, d)
+                    self.activate(a, b, c, d)
+                    return True
+        return False
+
+    def or_opt(self, a):
+        # déplace un segment de 1 à 3 villes contenant a (en tête ou en
+        # queue) entre deux villes voisines, éventuellement retourné
+        dist = self.dist
+        for length in range(1, 4):
+            if self.n < length + 3:
+                break
+            last = a
+            for _ in range(length - 1):
+                last = self.pred(last)
+            for s in {a, last}:
+                seg = [s]
+                while len(seg) < length:
+                    seg.append(self.succ(seg[-1]))
+                e = seg[-1]
+                p, f = self.pred(s), self.succ(e)
+                g = dist(p, s) + dist(e, f) - dist(p, f)
+                if g <= EPSILON:
+                    continue
+                for end in (s, e):
+                    for c in self.cand[end]:
+                        if g - dist(end, c) <= EPSILON:
+                            break
+                        if c in seg:
+                            continue
+                        for x, y in ((c, self.succ(c)), (self.pred(c), c)):
+                            if x in seg or y in seg:
+                                continue
+                            d_xy = dist(x, y)
+                            same = dist(x, s) + dist(e, y) - d_xy
+                            rev = dist(x, e) + dist(s, y) - d_xy
+                            if g - min(same, rev) > EPSILON:
+                                self._move(p, s, e, f, x, y, reverse=rev < same)
+                                self.activate(p, s, e, f, x, y)
+                                return True
+        return False
+
+    def _move(self, p, s, e, f, x, y, reverse):
+        # p s..e f ... x y  ->  p f ... x e..s y, puis x s..e y si besoin
+        self.exchange(p, s, x, y)
+        if x != f:
+            self.exchange(p, x, f, e)
+        if not reverse:
+            self.exchange(x, e, s, y)
+
+    def run(self, deadline=None):
+        queue, active = self.queue, self.active
+        steps = 0
+        while queue:
+            steps += 1
+            if deadline is not None and steps & 63 == 0 and time.perf_counter() > deadline:
+                break
+            a = queue.popleft()
+            active[a] = 0
+            if self.two_opt(a) or self.or_opt(a):
+                self.activate(a)
+
+def improve_tour(distances, path, neighbors=CANDIDATES, time_limit=None, coords=None):
+    """Améliore un tour par recherche locale 2-opt et Or-opt (segments de 1
+    à 3 villes, déplacés tels quels ou retournés).
+
+    Seuls les `neighbors` plus proches voisins de chaque ville sont essayés,
+    chaque mouvement est évalué en O(1) par différence de longueur, et des
+    bits « don't look » limitent l'exploration aux villes dont le voisinage
+    a changé. S'arrête à un optimum local ou après `time_limit` secondes.
+    Les distances doivent être symétriques ; avec `coords` (et
+    `distances=None`), elles sont euclidiennes et calculées à la volée, les
+    voisins candidats venant de l'arbre k-d. Renvoie (chemin,
+    distance), le chemin fermé partant de la même ville que `path`.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    tour = list(path)
+    if len(tour) > 1 and tour[0] == tour[-1]:
+        tour.pop()
+    start = tour[0]
+    if coords is not None:
+        xs, ys = _split_coords(coords)
+    if len(tour) >= 5:
+        if coords is not None:
+            search = _LocalSearch(
+                lambda i, j: math.hypot(xs[i] - xs[j], ys[i] - ys[j]),
+                tour,
+                _candidate_lists_coords(xs, ys, neighbors),
+            )
+        else:
+            d = distances.tolist() if np is not None and isinstance(distances, np.ndarray) else distances
+            search = _LocalSearch(lambda i, j: d[i][j], tour, _candidate_lists(d, neighbors))
+        search.run(deadline)
+        i = search.pos[start]
+        tour = tour[i:] + tour[:i]
+    path = tour + [start]
+    if coords is not None:
+        return path, _euclidean_length(xs, ys, path)
+    return path, tour_length(distances, path)
+
+def _init_bnb_worker(distances, shared):
+    _worker["search"] = _BranchAndBound(distances, None, float("inf"))
+    _worker["best"] = shared
+
+def _solve_prefix(prefix):
+    search = _worker["search"]
+    n = search.n
+    remaining = ((1 << n) - 1) & ~sum(1 << v for v in prefix)
+    cost = sum(search.d[a][b] for a, b in zip(prefix, prefix[1:]))
+    search.best_cost = float("inf")
+    search.best_path = None
+    search.search_shared(list(prefix), remaining, cost, _worker["best"])
+    return search.best_cost, search.best_path
+
+def _tour_prefixes(search, limit, count):
+    # préfixes de même longueur, dans l'ordre où la recherche séquentielle
+    # les visiterait ; on allonge jusqu'à en avoir au moins `count`
+    n = search.n
+    prefixes = [([0], ((1 << n) - 1) & ~1, 0)]
+    while prefixes and len(prefixes) < count and len(prefixes[0][0]) < n - 1:
+        longer = []
+        for path, remaining, cost in prefixes:
+            last = path[-1]
+            for v in search.order[last]:
+                if remaining >> v & 1:
+                    rest = remaining & ~(1 << v)
+                    c = cost + search.d[last][v]
+                    if search.bound(v, rest, c) <= limit:
+                        longer.append((path + [v], rest, c))
+        prefixes = longer
+    return [path for path, _, _ in prefixes]
+
+def parallel_branch_and_bound_tsp(distances, workers=None, initial=None):
+    """Branch and bound réparti sur plusieurs processus.
+
+    L'arbre de recherche est découpé en sous-arbres par préfixes de tour
+    fixés, distribués à un pool de `workers` processus. La meilleure
+    distance connue est partagée (multiprocessing.Value) pour que chaque
+    processus élague avec. Parmi les tours optimaux, on renvoie toujours le
+    premier dans l'ordre de la recherche séquentielle, quel que soit le
+    nombre de processus ou l'ordre d'arrivée des résultats.
+    """
+    n = len(distances)
+    if n <= 3:
+        return branch_and_bound_tsp(distances, initial)
+    if np is not None and isinstance(distances, np.ndarray):
+        distances = distances.tolist()
+    if initial is None:
+        initial = _initial_tour(distances)
+    limit = tour_length(distances, initial)
+    workers = workers or os.cpu_count() or 1
+    shared = multiprocessing.Value("d", limit)
+    prefixes = _tour_prefixes(_BranchAndBound(distances, None, limit), limit, workers * TASKS_PER_WORKER)
+    if workers == 1:
+        _init_bnb_worker(distances, shared)
+        try:
+            results = [_solve_prefix(p) for p in prefixes]
+        finally:
+            _worker.clear()
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_bnb_worker, initargs=(distances, shared)) as pool:
+            results = list(pool.map(_solve_prefix, prefixes))
+    best_cost, best_path = limit, list(initial)
+    # min strict dans l'ordre des préfixes : départage déterministe
+    for cost, path in results:
+        if path is not None and cost < best_cost:
+            best_cost, best_path = cost, path
+    return best_path, tour_length(distances, best_path)
+
+EXACT_METHODS = {
+    "held_karp": held_karp_tsp,
+    "branch_and_bound": branch_and_bound_tsp,
+    "parallel_branch_and_bound": parallel_branch_and_bound_tsp,
+}
+
+def exact_tsp(distances, method=None):
+    """Tour optimal : (chemin, distance). `method` vaut "held_karp",
+    "branch_and_bound" ou "parallel_branch_and_bound" ; par défaut Held-Karp jusqu'à HELD_KARP_LIMIT villes."""
+    if method is None:
+        method = "held_karp" if len(distances) <= HELD_KARP_LIMIT else "branch_and_bound"
+    if method not in EXACT_METHODS:
+        raise ValueError(f"méthode inconnue : {method}")
+    return EXACT_METHODS[method](distances)
@@ -0,0 +1,149 @@
+from array import array
+
+
+class CSRGraph:
+    """Graphe compact au format CSR (compressed sparse row).
+
+    Les sommets sont numérotés de 0 à n-1 ; les voisins du sommet i sont
+    targets[offsets[i]:offsets[i + 1]] et, si le graphe est pondéré, leurs
+    poids sont aux mêmes positions dans weights. `labels` et `index` font
+    la correspondance étiquette <-> identifiant.
+
+    Le graphe se comporte comme les dictionnaires utilisés jusqu'ici :
+    graph[u] renvoie les voisins de u (ou les couples (v, poids) si le
+    graphe est pondéré), ce qui permet de le passer directement à dfs, bfs,
+    dijkstra, etc.
+    """
+
+    __slots__ = ("labels", "index", "offsets", "targets", "weights")
+
+    def __init__(self, labels, offsets, targets, weights=None):
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_arrays(cls, labels, sources, targets, weights=None):
+        n = len(labels)
+        m = len(sources)
+        degree = [0] * (n + 1)
+        for u in sources:
+            degree[u + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        offsets = array("q", degree)
+        csr_targets = array(_index_typecode(n), [0]) * m
+        csr_weights = None
+        if weights is not None:
+            typecode = weights.typecode if isinstance(weights, array) else _weight_typecode(weights)
+            csr_weights = array(typecode, [0]) * m
+        fill = degree[:n]
+        for k in range(m):
+            u = sources[k]
+            pos = fill[u]
+            csr_targets[pos] = targets[k]
+            if csr_weights is not None:
+                csr_weights[pos] = weights[k]
+            fill[u] += 1
+        return cls(labels, offsets, csr_targets, csr_weights)
+
+    @classmethod
+    def from_edges(cls, nodes, edges, weighted=None, undirected=False):
+        labels = list(nodes)
+        index = {label: i for i, label in enumerate(labels)}
+        edges = [tuple(e) for e in edges]
+        if weighted is None:
+            weighted = bool(edges) and len(edges[0]) == 3
+        if undirected:
+            seen = {(e[0], e[1]) for e in edges}
+            edges += [(e[1], e[0]) + e[2:] for e in edges if (e[1], e[0]) not in seen]
+        sources = [index[e[0]] for e in edges]
+        targets = [index[e[1]] for e in edges]
+        weights = [e[2] for e in edges] if weighted else None
+        return cls.from_arrays(labels, sources, targets, weights)
+
+    @classmethod
+    def from_matrix(cls, nodes, matrix, weighted=True, undirected=False):
+        n = len(nodes)
+        edges = []
+        for i in range(n):
+            row = matrix[i]
+            for j in range(n):
+                w = row[j]
+                if w == 0 and undirected:
+                    w = matrix[j][i]
+                if w != 0:
+                    edges.append((nodes[i], nodes[j], w) if weighted else (nodes[i], nodes[j]))
+        return cls.from_edges(nodes, edges, weighted=weighted)
+
+    @classmethod
+    def from_adjacency(cls, adj):
+        nodes = list(adj)
+        edges = []
+        weighted = False
+        for u in nodes:
+            for item in adj[u]:
+                if isinstance(item, tuple):
+                    weighted = True
+                    edges.append((u,) + item)
+                else:
+                    edges.append((u, item))
+        return cls.from_edges(nodes, edges, weighted=weighted)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def keys(self):
+        return list(self.labels)
+
+    def __getitem__(self, label):
+        i = self.index[label]
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        labels = self.labels
+        if self.weights is None:
+            return [labels[v] for v in self.targets[lo:hi]]
+        return [(labels[v], w) for v, w in zip(self.targets[lo:hi], self.weights[lo:hi])]
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def weighted(self):
+        return self.weights is not None
+
+    def neighbors(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def edges(self):
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        for u in range(len(self.labels)):
+            for pos in range(offsets[u], offsets[u + 1]):
+                yield u, targets[pos], weights[pos] if weights is not None else 1
+
+    def edge_list(self):
+        labels = self.labels
+        return [(labels[u], labels[v], w) for u, v, w in self.edges()]
+
+
+def _index_typecode(n):
+    return "i" if n < 2 ** 31 else "q"
+
+
+def _weight_typecode(weights):
+    for w in weights:
+        if not isinstance(w, int):
+            return "d"
+    return "q"
@@ -0,0 +1,330 @@
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+
+from algo.graph import CSRGraph
+
+CHUNK_SIZE = 1 << 20
+
+_WS = re.compile(r"[ \t\n\r]*")
+_STRUCTURAL = re.compile(r'[{}\[\]"\\]')
+_DECODER = json.JSONDecoder()
+
+_CACHE_MAGIC = b"CSRGRPH1"
+_CACHE_HEADER = struct.Struct("<8sqqqqcc6x")
+
+
+class _JSONStream:
+    """Lecteur JSON incrémental : ne garde en mémoire qu'un morceau du fichier."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        if self.eof:
+            return False
+        data = self.f.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("fin de fichier JSON inattendue")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"'{char}' attendu à la position {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        # chaque nouvel essai décode la valeur depuis le début : la taille lue
+        # double à chaque fois pour que le total reste linéaire
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # un nombre en fin de tampon peut être tronqué
+            if end == len(self.buf) and self._fill(size):
+                size *= 2
+                continue
+            self.pos = end
+            return value
+
+    def skip(self):
+        if self.peek() not in "{[":
+            self.value()
+            return
+        depth = 0
+        in_string = False
+        while True:
+            m = _STRUCTURAL.search(self.buf, self.pos)
+            if m is None:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("fin de fichier JSON inattendue")
+                continue
+            char = m.group()
+            self.pos = m.end()
+            if char == "\\":
+                if self.pos == len(self.buf) and not self._fill():
+                    raise ValueError("fin de fichier JSON inattendue")
+                self.pos += 1
+            elif char == '"':
+                in_string = not in_string
+            elif in_string:
+                continue
+            elif char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def items(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"',' ou ']' attendu à la position {self.pos - 1}")
+
+    def keys(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"',' ou '}}' attendu à la position {self.pos - 1}")
+
+
+class _EdgeBuffer:
+    def __init__(self, weighted):
+        self.sources = array("q")
+        self.targets = array("q")
+        self.weights = array("q") if weighted else None
+
+    def add(self, u, v, w):
+        self.sources.append(u)
+        self.targets.append(v)
+        if self.weights is not None:
+            if self.weights.typecode == "q" and not isinstance(w, int):
+                self.weights = array("d", self.weights)
+            self.weights.append(w)
+
+    def symmetrize(self, n):
+        seen = {u * n + v for u, v in zip(self.sources, self.targets)}
+        for k in range(len(self.sources)):
+            u, v = self.sources[k], self.targets[k]
+            if v * n + u not in seen:
+                seen.add(v * n + u)
+                self.add(v, u, self.weights[k] if self.weights is not None else 1)
+
+
+def _read_graph(stream, graph_id, weighted, undirected):
+    gid = None
+    nodes = None
+    index = None
+    edges = _EdgeBuffer(weighted)
+    pending = []
+    for key in stream.keys():
+        if key == "id":
+            gid = stream.value()
+        elif gid is not None and gid != graph_id:
+            stream.skip()
+        elif key == "nodes":
+            nodes = [stream.value() for _ in stream.items()]
+            index = {label: i for i, label in enumerate(nodes)}
+        elif key == "matrix":
+            for i, _ in enumerate(stream.items()):
+                for j, w in enumerate(stream.value()):
+                    if w != 0:
+                        edges.add(i, j, w)
+        elif key == "edges":
+            for _ in stream.items():
+                edge = stream.value()
+                if index is None:
+                    pending.append(edge)
+                    continue
+                edges.add(index[edge[0]], index[edge[1]], edge[2] if len(edge) > 2 else 1)
+        else:
+            stream.skip()
+    if gid != graph_id:
+        return None
+    if nodes is None:
+        nodes = []
+        index = {}
+        for edge in pending:
+            for label in edge[:2]:
+                if label not in index:
+                    index[label] = len(nodes)
+                    nodes.append(label)
+    for edge in pending:
+        edges.add(index[edge[0]], index[edge[1]], edge[2] if len(edge) > 2 else 1)
+    if undirected:
+        edges.symmetrize(len(nodes))
+    return CSRGraph.from_arrays(nodes, edges.sources, edges.targets, edges.weights)
+
+
+def iter_graph_ids(path, chunk_size=CHUNK_SIZE):
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JSONStream(f, chunk_size)
+        for key in stream.keys():
+            if key != "graphs":
+                stream.skip()
+                continue
+            for _ in stream.items():
+                for field in stream.keys():
+                    if field == "id":
+                        yield stream.value()
+                    else:
+                        stream.skip()
+
+
+def load_graph(path, graph_id, weighted=True, undirected=False, cache_dir=None, chunk_size=CHUNK_SIZE):
+    """Charge le graphe `graph_id` de `path` sans décoder les autres graphes.
+
+    Chaque graphe fournit soit une matrice dense ("matrix"), soit une liste
+    d'arêtes ("edges" : [u, v] ou [u, v, poids], étiquettes de "nodes").
+    Avec `cache_dir`, le graphe analysé est enregistré au format binaire
+    et les appels suivants le relisent par mmap tant que le fichier source
+    n'a pas changé.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        name = os.path.splitext(os.path.basename(path))[0]
+        flags = ("w" if weighted else "u") + ("s" if undirected else "d")
+        cache_path = os.path.join(cache_dir, f"{name}-{graph_id}-{flags}.csr")
+        graph = load_cache(cache_path, source=path)
+        if graph is not None:
+            return graph
+    graph = None
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JSONStream(f, chunk_size)
+        for key in stream.keys():
+            if key != "graphs":
+                stream.skip()
+                continue
+            for _ in stream.items():
+                graph = _read_graph(stream, graph_id, weighted, undirected)
+                if graph is not None:
+                    break
+            break
+    if graph is None:
+        raise KeyError(graph_id)
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_cache(graph, cache_path, source=path)
+    return graph
+
+
+def save_cache(graph, cache_path, source=None):
+    labels = json.dumps(graph.labels).encode("utf-8")
+    size, mtime = _source_stamp(source)
+    wcode = graph.weights.typecode if graph.weights is not None else "-"
+    header = _CACHE_HEADER.pack(
+        _CACHE_MAGIC, graph.num_nodes, graph.num_edges, size, mtime,
+        graph.targets.typecode.encode(), wcode.encode(),
+    )
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(struct.pack("<q", len(labels)))
+        f.write(labels)
+        f.write(b"\0" * (-len(labels) % 8))
+        for buf in (graph.offsets, graph.targets, graph.weights):
+            if buf is not None:
+                data = bytes(buf) if isinstance(buf, memoryview) else buf.tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))
+    os.replace(tmp_path, cache_path)
+
+
+def load_cache(cache_path, source=None):
+    """Relit un cache binaire par mmap ; renvoie None s'il est absent, périmé,
+    tronqué ou illisible."""
+    try:
+        f = open(cache_path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size < _CACHE_HEADER.size:
+            return None
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return None
+    magic, n, m, size, mtime, tcode, wcode = _CACHE_HEADER.unpack_from(mm)
+    if magic != _CACHE_MAGIC or (source is not None and (size, mtime) != _source_stamp(source)):
+        mm.close()
+        return None
+    try:
+        return _read_cache_body(mm, n, m, tcode, wcode)
+    except (ValueError, TypeError, struct.error):
+        # fichier tronqué ou corrompu : même traitement qu'un cache absent
+        return None
+
+
+def _read_cache_body(mm, n, m, tcode, wcode):
+    view = memoryview(mm)
+    pos = _CACHE_HEADER.size
+    (labels_len,) = struct.unpack_from("<q", mm, pos)
+    pos += 8
+
+    def take(typecode, count):
+        nonlocal pos
+        nbytes = count * array(typecode).itemsize
+        if count < 0 or pos + nbytes > len(mm):
+            raise ValueError("cache tronqué")
+        buf = view[pos:pos + nbytes].cast(typecode)
+        pos += nbytes + (-nbytes % 8)
+        return buf
+
+    labels = json.loads(bytes(take("B", labels_len)).decode("utf-8"))
+    if len(labels) != n:
+        raise ValueError("cache incohérent")
+    offsets = take("q", n + 1)
+    targets = take(tcode.decode(), m)
+    weights = take(wcode.decode(), m) if wcode != b"-" else None
+    return CSRGraph(labels, offsets, targets, weights)
+
+
+def _source_stamp(source):
+    if source is None:
+        return 0, 0
+    st = os.stat(source)
+    return st.st_size, st.st_mtime_ns
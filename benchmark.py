@@ -0,0 +1,366 @@
+"""Banc d'essai non interactif des algorithmes sur des données synthétiques.
+
+Exemples :
+    python3 benchmark.py --list
+    python3 benchmark.py -b dijkstra sort --scale small
+    python3 benchmark.py --json base.json
+    python3 benchmark.py --baseline base.json --tolerance 0.15
+"""
+import argparse
+import csv
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from algo.graph import CSRGraph
+from algo.EX1.bfs import bfs, connected_components
+from algo.EX1.dfs import dfs_preorder
+from algo.EX2.dijkstra import dijkstra
+from algo.EX3.bellman_ford import bellman_ford_queue
+from algo.EX4.max_flow import max_flow
+from algo.EX5.quicksort import deterministic_quicksort, sort
+from algo.EX6.avl import AVLTree
+from algo.EX7.sat import CDCLSolver
+from algo.EX7.tsp import (
+    nearest_neighbor_tsp,
+    improve_tour,
+    held_karp_tsp,
+    branch_and_bound_tsp,
+)
+
+FIELDS = ("benchmark", "size", "repeat", "median", "p95", "min", "mean", "peak_kib")
+
+
+# --- générateurs de données (déterministes pour une graine donnée) ---
+
+def random_graph(n, degree, seed, weighted=True, max_weight=100):
+    """Graphe orienté de n sommets, `degree` arcs sortants aléatoires par sommet."""
+    rng = random.Random(seed)
+    sources = [u for u in range(n) for _ in range(degree)]
+    targets = [rng.randrange(n) for _ in sources]
+    weights = [rng.randint(1, max_weight) for _ in sources] if weighted else None
+    return CSRGraph.from_arrays(range(n), sources, targets, weights)
+
+
+def grid_graph(side, seed, weighted=True, max_weight=100):
+    """Grille side x side non orientée (4-voisinage), poids aléatoires."""
+    rng = random.Random(seed)
+    sources, targets, weights = [], [], []
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c
+            for v in ((u + 1,) if c + 1 < side else ()) + ((u + side,) if r + 1 < side else ()):
+                w = rng.randint(1, max_weight)
+                sources += [u, v]
+                targets += [v, u]
+                weights += [w, w]
+    return CSRGraph.from_arrays(range(side * side), sources, targets, weights if weighted else None)
+
+
+def flow_network(n, degree, seed, max_capacity=1000):
+    """Réseau en couches de la source 0 au puits n - 1, capacités aléatoires."""
+    rng = random.Random(seed)
+    width = max(1, int(math.sqrt(n)))
+    sources, targets, capacities = [], [], []
+    for u in range(n - 1):
+        layer_end = min(n - 1, (u // width + 2) * width)
+        for _ in range(degree):
+            v = rng.randint(u + 1, layer_end)
+            sources.append(u)
+            targets.append(v)
+            capacities.append(rng.randint(1, max_capacity))
+    return CSRGraph.from_arrays(range(n), sources, targets, capacities)
+
+
+def random_cnf(num_vars, seed, ratio=4.26, k=3):
+    """Formule k-SAT aléatoire (clauses DIMACS) au rapport clauses/variables donné."""
+    rng = random.Random(seed)
+    return [
+        [v if rng.random() < 0.5 else -v for v in rng.sample(range(1, num_vars + 1), k)]
+        for _ in range(int(num_vars * ratio))
+    ]
+
+
+def tsp_points(n, seed):
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def tsp_matrix(n, seed):
+    points = tsp_points(n, seed)
+    return [[math.dist(a, b) for b in points] for a in points]
+
+
+def random_ints(n, seed):
+    rng = random.Random(seed)
+    return [rng.randrange(n * 4) for _ in range(n)]
+
+
+# --- bancs : (préparation hors chrono, fonction mesurée, tailles par échelle) ---
+
+def _flow(method):
+    return lambda g: max_flow(g, 0, g.num_nodes - 1, method)
+
+
+def _improve_setup(n, seed):
+    points = tsp_points(n, seed)
+    return points, nearest_neighbor_tsp(None, 0, coords=points)[0]
+
+
+BENCHMARKS = {
+    "bfs": (
+        lambda n, seed: random_graph(n, 8, seed, weighted=False),
+        lambda g: bfs(g, 0),
+        {"small": [1000], "default": [10000, 100000], "large": [1000000]},
+    ),
+    "dfs": (
+        lambda n, seed: random_graph(n, 8, seed, weighted=False),
+        lambda g: deque(dfs_preorder(g, 0), maxlen=0),
+        {"small": [1000], "default": [10000, 100000], "large": [1000000]},
+    ),
+    "connected_components": (
+        lambda n, seed: grid_graph(int(math.sqrt(n)), seed, weighted=False),
+        connected_components,
+        {"small": [1024], "default": [10000, 90000], "large": [1000000]},
+    ),
+    "dijkstra": (
+        lambda n, seed: random_graph(n, 8, seed),
+        lambda g: dijkstra(g, 0),
+        {"small": [1000], "default": [10000, 100000], "large": [500000]},
+    ),
+    "dijkstra_grid": (
+        lambda n, seed: grid_graph(int(math.sqrt(n)), seed),
+        lambda g: dijkstra(g, 0),
+        {"small": [1024], "default": [10000, 90000], "large": [250000]},
+    ),
+    "bellman_ford_queue": (
+        lambda n, seed: random_graph(n, 8, seed),
+        lambda g: bellman_ford_queue(g, source=0),
+        {"small": [1000], "default": [10000, 50000], "large": [200000]},
+    ),
+    "max_flow_dinic": (
+        lambda n, seed: flow_network(n, 4, seed),
+        _flow("dinic"),
+        {"small": [200], "default": [1000, 5000], "large": [20000]},
+    ),
+    "max_flow_push_relabel": (
+        lambda n, seed: flow_network(n, 4, seed),
+        _flow("push_relabel"),
+        {"small": [200], "default": [1000, 5000], "large": [20000]},
+    ),
+    "max_flow_edmonds_karp": (
+        lambda n, seed: flow_network(n, 4, seed),
+        _flow("edmonds_karp"),
+        {"small": [200], "default": [1000, 5000], "large": [20000]},
+    ),
+    "quicksort": (
+        random_ints,
+        deterministic_quicksort,
+        {"small": [10000], "default": [100000, 1000000], "large": [5000000]},
+    ),
+    "sort": (
+        random_ints,
+        lambda data: sort(data, workers=1),
+        {"small": [10000], "default": [100000, 1000000], "large": [5000000]},
+    ),
+    "avl_build": (
+        random_ints,
+        AVLTree,
+        {"small": [10000], "default": [100000], "large": [1000000]},
+    ),
+    "sat_cdcl": (
+        random_cnf,
+        lambda clauses: CDCLSolver(clauses).solve(),
+        {"small": [50], "default": [100, 150], "large": [250]},
+    ),
+    "tsp_nearest_neighbor": (
+        tsp_points,
+        lambda points: nearest_neighbor_tsp(None, 0, coords=points),
+        {"small": [1000], "default": [10000, 100000], "large": [1000000]},
+    ),
+    "tsp_improve": (
+        _improve_setup,
+        lambda data: improve_tour(None, data[1], coords=data[0]),
+        {"small": [1000], "default": [10000], "large": [100000]},
+    ),
+    "tsp_held_karp": (
+        tsp_matrix,
+        held_karp_tsp,
+        {"small": [10], "default": [14, 17], "large": [20]},
+    ),
+    "tsp_branch_and_bound": (
+        tsp_matrix,
+        branch_and_bound_tsp,
+        {"small": [10], "default": [15, 20], "large": [25]},
+    ),
+}
+
+
+# --- mesure ---
+
+def percentile(values, q):
+    """Percentile par rang le plus proche (valeurs triées)."""
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def measure(fn, data, repeat=5, warmup=1):
+    """Temps (secondes) de `repeat` appels après `warmup` appels à blanc,
+    puis pic mémoire d'un appel supplémentaire sous tracemalloc (non chronométré)."""
+    for _ in range(warmup):
+        fn(data)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn(data)
+        times.append(time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    times.sort()
+    return {
+        "repeat": repeat,
+        "median": statistics.median(times),
+        "p95": percentile(times, 95),
+        "min": times[0],
+        "mean": statistics.fmean(times),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run(names, scale="default", sizes=None, repeat=5, warmup=1, seed=0, out=sys.stdout):
+    results = []
+    for name in names:
+        setup, fn, scales = BENCHMARKS[name]
+        for size in sizes or scales[scale]:
+            data = setup(size, seed)
+            row = {"benchmark": name, "size": size}
+            row.update(measure(fn, data, repeat, warmup))
+            results.append(row)
+            if out is not None:
+                print(_format(row), file=out, flush=True)
+    return results
+
+
+def _format(row, extra=""):
+    return (
+        f"{row['benchmark']:<24} {row['size']:>9}  "
+        f"médiane {row['median'] * 1e3:>10.2f} ms  p95 {row['p95'] * 1e3:>10.2f} ms  "
+        f"pic {row['peak_kib']:>10.0f} Kio{extra}"
+    )
+
+
+# --- export et comparaison ---
+
+def save_json(results, path, meta):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+def save_csv(results, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in results:
+            writer.writerow({key: row[key] for key in FIELDS})
+
+
+def load_results(path):
+    """Résultats d'un export JSON ou CSV précédent."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return [
+                {key: (value if key == "benchmark" else float(value)) for key, value in row.items()}
+                for row in csv.DictReader(f)
+            ]
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, tolerance=0.10):
+    """Associe chaque mesure à la référence (même banc, même taille).
+
+    Renvoie [(ligne, rapport des médianes ou None, régression ?)] : une
+    régression est une médiane plus de `tolerance` fois plus lente.
+    """
+    reference = {(row["benchmark"], int(row["size"])): row for row in baseline}
+    report = []
+    for row in results:
+        base = reference.get((row["benchmark"], int(row["size"])))
+        if base is None or not base["median"]:
+            report.append((row, None, False))
+            continue
+        ratio = row["median"] / base["median"]
+        report.append((row, ratio, ratio > 1 + tolerance))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des algorithmes sur données synthétiques.")
+    parser.add_argument("-b", "--bench", nargs="+", choices=sorted(BENCHMARKS), metavar="NOM",
+                        help="bancs à exécuter (par défaut : tous)")
+    parser.add_argument("--scale", choices=("small", "default", "large"), default="default",
+                        help="jeu de tailles prédéfini")
+    parser.add_argument("--sizes", nargs="+", type=int, help="tailles explicites (remplacent --scale)")
+    parser.add_argument("--repeat", type=int, default=5, help="nombre d'exécutions mesurées")
+    parser.add_argument("--warmup", type=int, default=1, help="exécutions à blanc avant mesure")
+    parser.add_argument("--seed", type=int, default=0, help="graine des générateurs")
+    parser.add_argument("--json", help="exporte les résultats en JSON")
+    parser.add_argument("--csv", help="exporte les résultats en CSV")
+    parser.add_argument("--baseline", help="résultats de référence (JSON ou CSV) à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="ralentissement relatif toléré avant de signaler une régression")
+    parser.add_argument("--list", action="store_true", help="liste les bancs et leurs tailles")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (_, _, scales) in BENCHMARKS.items():
+            print(f"{name:<24} " + "  ".join(f"{k}={v}" for k, v in scales.items()))
+        return 0
+
+    names = args.bench or list(BENCHMARKS)
+    results = run(names, args.scale, args.sizes, args.repeat, args.warmup, args.seed,
+                  out=None if args.baseline else sys.stdout)
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if args.json:
+        save_json(results, args.json, meta)
+    if args.csv:
+        save_csv(results, args.csv)
+    if not args.baseline:
+        return 0
+    regressions = 0
+    for row, ratio, regressed in compare(results, load_results(args.baseline), args.tolerance):
+        if ratio is None:
+            extra = "  (pas de référence)"
+        else:
+            extra = f"  x{ratio:.2f}" + ("  RÉGRESSION" if regressed else "")
+        regressions += regressed
+        print(_format(row, extra))
+    if regressions:
+        print(f"\n{regressions} régression(s) au-delà de {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
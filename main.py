@@ -1,18 +1,19 @@
-import json
 import time
 import random
 import os
 import sys
-from algo.EX1.dfs import dfs, has_cycle
+from functools import lru_cache
+from algo.loader import load_graph
+from algo.EX1.dfs import dfs_preorder, has_cycle
 from algo.EX1.bfs import bfs, connected_components
-from algo.EX2.dijkstra import dijkstra, reconstruct_path as reconstruct_dijkstra_path
-from algo.EX3.bellman_ford import bellman_ford, reconstruct_path as reconstruct_bf_path
+from algo.EX2.dijkstra import dijkstra, DijkstraService, reconstruct_path as reconstruct_dijkstra_path
+from algo.EX3.bellman_ford import bellman_ford_queue, reconstruct_path as reconstruct_bf_path
 from algo.EX4.ford_fulkerson import ford_fulkerson
 from algo.EX4.edmonds_karp import edmonds_karp
 from algo.EX5.quicksort import deterministic_quicksort, randomized_quicksort
 from algo.EX6.avl import insert, delete, inorder, Node
-from algo.EX7.sat import parse_clause, verify_sat, solve_sat_backtrack
-from algo.EX7.tsp import nearest_neighbor_tsp, verify_tsp_solution, brute_force_tsp
+from algo.EX7.sat import parse_clause, verify_sat, solve_sat_backtrack, solve_sat_cdcl
+from algo.EX7.tsp import nearest_neighbor_tsp, verify_tsp_solution, improve_tour, held_karp_tsp, branch_and_bound_tsp
 
 def clear_screen():
     """Efface l'écran selon l'OS"""
@@ -48,50 +49,16 @@ def wait_for_key():
     """Attend que l'utilisateur appuie sur une touche"""
     input("\n📍 Appuyez sur Entrée pour continuer...")
 
+# graphe1 est non orienté (matrice symétrique), graph_cycle est orienté
+DIRECTED_GRAPHS = {"graph_cycle"}
+
+@lru_cache(maxsize=None)
 def load_graphs():
-    with open("matrice.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-    graphs = {}
-    for g in data["graphs"]:
-        if g["id"] in ["graphe1", "graph_cycle"]:
-            nodes = g["nodes"]
-            mat = g["matrix"]
-            adj = {n: set() for n in nodes}
-            nlen = len(nodes)
-            for i in range(nlen):
-                for j in range(nlen):
-                    if mat[i][j] == 1:
-                        adj[nodes[i]].add(nodes[j])
-            graphs[g["id"]] = adj
-    return graphs
+    return {gid: load_graph("matrice.json", gid, weighted=False) for gid in ["graphe1", "graph_cycle"]}
 
+@lru_cache(maxsize=None)
 def load_weighted_graph(graph_id):
-    with open("matrice.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-    for g in data["graphs"]:
-        if g["id"] == graph_id:
-            nodes = g["nodes"]
-            mat = g["matrix"]
-            nlen = len(nodes)
-            adj = {n: [] for n in nodes}
-            edge_list = []
-            for i in range(nlen):
-                for j in range(nlen):
-                    w = mat[i][j]
-                    if w != 0:
-                        u = nodes[i]
-                        v = nodes[j]
-                        if graph_id == "graphe_dijkstra":
-                            adj[u].append((v, w))
-                        else:
-                            edge_list.append((u, v, w))
-                        if graph_id == "graphe_dijkstra" and i != j:
-                            adj[v].append((u, w))
-            if graph_id == "graphe_dijkstra":
-                return adj
-            else:
-                return nodes, edge_list, mat
-    return None
+    return load_graph("matrice.json", graph_id, undirected=(graph_id == "graphe_dijkstra"))
 
 def test_dfs():
     print("\n🔍 === Test DFS (Parcours en profondeur) ===")
@@ -99,11 +66,11 @@ def test_dfs():
     for gid, graph in graphs.items():
         print(f"\n📊 Graphe: {gid}")
         for start in sorted(graph.keys()):
-            print(f"Départ: {start} =>", end=" ")
             t0 = time.perf_counter()
-            visited = dfs(graph, start)
+            ordre = list(dfs_preorder(graph, start, sort=True))
             t1 = time.perf_counter()
-            print(f"\nSommet(s) visités depuis {start}: {sorted(visited)}")
+            print(f"Départ: {start} => {' '.join(ordre)}")
+            print(f"Sommet(s) visités depuis {start}: {sorted(ordre)}")
             print(f"⏱️  Temps DFS({start}): {(t1 - t0) * 1e3:.6f} ms\n")
 
 def test_bfs():
@@ -112,11 +79,11 @@ def test_bfs():
     for gid, graph in graphs.items():
         print(f"\n📊 Graphe: {gid}")
         for start in sorted(graph.keys()):
-            print(f"Départ: {start} =>", end=" ")
             t0 = time.perf_counter()
-            ordre = bfs(graph, start)
+            ordre = bfs(graph, start, sort=True)
             t1 = time.perf_counter()
-            print(f"\nSommet(s) visités depuis {start}: {ordre}")
+            print(f"Départ: {start} => {' '.join(ordre)}")
+            print(f"Sommet(s) visités depuis {start}: {ordre}")
             print(f"⏱️  Temps BFS({start}): {(t1 - t0) * 1e3:.6f} ms\n")
 
 def test_cycle():
@@ -125,7 +92,7 @@ def test_cycle():
     for gid, graph in graphs.items():
         print(f"\n📊 Graphe: {gid}")
         t0 = time.perf_counter()
-        cycle = has_cycle(graph)
+        cycle = has_cycle(graph, directed=gid in DIRECTED_GRAPHS)
         t1 = time.perf_counter()
         if cycle:
             print("✅ Cycle détecté")
@@ -139,7 +106,7 @@ def test_connected_components():
     for gid, graph in graphs.items():
         print(f"\n📊 Graphe: {gid}")
         t0 = time.perf_counter()
-        comps = connected_components(graph)
+        comps = connected_components(graph, sort=True)
         t1 = time.perf_counter()
         for idx, comp in enumerate(comps, start=1):
             print(f"Composante {idx}: {sorted(comp)}")
@@ -161,15 +128,29 @@ def test_dijkstra():
         print(f"  A -> {node} : {'->'.join(path)}")
     print(f"\n⏱️  Temps Dijkstra: {(t1 - t0) * 1e3:.6f} ms")
 
+    print("\n🔁 DijkstraService sur un graphe non pondéré (graphe1) :")
+    graph = load_graphs()["graphe1"]
+    service = DijkstraService(graph)
+    for source in sorted(graph.keys()):
+        dist, _ = dijkstra(graph, source)
+        tree_dist, _ = service.tree(source)
+        expected = {node: d for node, d in dist.items() if d != float("inf")}
+        assert tree_dist == expected, f"DijkstraService : distances erronées depuis {source}"
+        for target in sorted(graph.keys()):
+            d, path = service.shortest_path(source, target)
+            assert d == dist[target], f"DijkstraService : {source} -> {target} = {d}, attendu {dist[target]}"
+            assert path is None or (path[0] == source and path[-1] == target and len(path) == d + 1)
+    print("✅ Distances identiques à dijkstra() pour toutes les paires")
+
 def test_bellman_ford():
     print("\n🛣️  === Algorithme de Bellman-Ford (source = 'A') ===")
-    nodes, edge_list, _ = load_weighted_graph("graphe_bellman")
+    graph = load_weighted_graph("graphe_bellman")
     source = "A"
     t0 = time.perf_counter()
-    dist, parent, has_neg_cycle = bellman_ford(nodes, edge_list, source)
+    dist, parent, neg_cycle = bellman_ford_queue(graph, source=source)
     t1 = time.perf_counter()
-    if has_neg_cycle:
-        print("⚠️  Cycle de poids négatif détecté dans le graphe.")
+    if neg_cycle:
+        print(f"⚠️  Cycle de poids négatif détecté dans le graphe : {'->'.join(neg_cycle + neg_cycle[:1])}")
     else:
         print("📏 Distances depuis A :")
         for node in sorted(dist.keys()):
@@ -183,24 +164,18 @@ def test_bellman_ford():
 
 def test_ford_fulkerson():
     print("\n💧 === Algorithme de Ford-Fulkerson (A -> F) ===")
-    nodes, _, capacity_mat = load_weighted_graph("graphe_flux")
-    index_map = {node: idx for idx, node in enumerate(nodes)}
-    source = index_map["A"]
-    sink = index_map["F"]
+    graph = load_weighted_graph("graphe_flux")
     t0 = time.perf_counter()
-    max_flow = ford_fulkerson(capacity_mat, source, sink)
+    max_flow = ford_fulkerson(graph, "A", "F")
     t1 = time.perf_counter()
     print(f"💦 Flux maximum de A vers F = {max_flow}")
     print(f"⏱️  Temps Ford-Fulkerson: {(t1 - t0) * 1e3:.6f} ms")
 
 def test_edmonds_karp():
     print("\n💧 === Algorithme d'Edmonds-Karp (A -> F) ===")
-    nodes, _, capacity_mat = load_weighted_graph("graphe_flux")
-    index_map = {node: idx for idx, node in enumerate(nodes)}
-    source = index_map["A"]
-    sink = index_map["F"]
+    graph = load_weighted_graph("graphe_flux")
     t0 = time.perf_counter()
-    max_flow = edmonds_karp(capacity_mat, source, sink)
+    max_flow = edmonds_karp(graph, "A", "F")
     t1 = time.perf_counter()
     print(f"💦 Flux maximum de A vers F = {max_flow}")
     print(f"⏱️  Temps Edmonds-Karp: {(t1 - t0) * 1e3:.6f} ms")
@@ -279,6 +254,15 @@ def test_sat():
     print(f"{'✅' if solvable else '❌'} Formule satisfiable: {solvable}")
     print(f"⏱️  Temps résolution: {(t1 - t0) * 1e3:.6f} ms")
 
+    print("\n🧠 --- Résolution CDCL ---")
+    t0 = time.perf_counter()
+    model = solve_sat_cdcl(clauses, variables)
+    t1 = time.perf_counter()
+    print(f"{'✅' if model else '❌'} Formule satisfiable: {model is not None}")
+    if model:
+        print(f"🔢 Modèle: {model}")
+    print(f"⏱️  Temps résolution: {(t1 - t0) * 1e3:.6f} ms")
+
 def test_tsp():
     print("\n🗺️  === Heuristique TSP (Problème du Voyageur de Commerce) ===")
     distances = [
@@ -304,15 +288,31 @@ def test_tsp():
     print(f"⏱️  Temps heuristique: {(t1 - t0) * 1e3:.6f} ms")
     
     print(f"\n✅ Vérification solution (distance <= 100): {verify_tsp_solution(distances, heuristic_path, 100)}")
+
+    print("\n🔧 --- Amélioration locale (2-opt / Or-opt) ---")
+    t0 = time.perf_counter()
+    improved_path, improved_distance = improve_tour(distances, heuristic_path)
+    t1 = time.perf_counter()
+    print(f"🛤️  Chemin amélioré: {' -> '.join(cities[i] for i in improved_path)}")
+    print(f"📏 Distance totale: {improved_distance}")
+    print(f"⏱️  Temps amélioration: {(t1 - t0) * 1e3:.6f} ms")
     
-    print("\n💪 --- Solution optimale (force brute) ---")
+    print("\n💪 --- Solution optimale (Held-Karp) ---")
     t0 = time.perf_counter()
-    optimal_path, optimal_distance = brute_force_tsp(distances)
+    optimal_path, optimal_distance = held_karp_tsp(distances)
     t1 = time.perf_counter()
     optimal_path_cities = [cities[i] for i in optimal_path]
     print(f"🏆 Chemin optimal: {' -> '.join(optimal_path_cities)}")
     print(f"📏 Distance optimale: {optimal_distance}")
-    print(f"⏱️  Temps force brute: {(t1 - t0) * 1e3:.6f} ms")
+    print(f"⏱️  Temps Held-Karp: {(t1 - t0) * 1e3:.6f} ms")
+
+    print("\n🌳 --- Solution optimale (branch and bound) ---")
+    t0 = time.perf_counter()
+    bnb_path, bnb_distance = branch_and_bound_tsp(distances)
+    t1 = time.perf_counter()
+    print(f"🏆 Chemin optimal: {' -> '.join(cities[i] for i in bnb_path)}")
+    print(f"📏 Distance optimale: {bnb_distance}")
+    print(f"⏱️  Temps branch and bound: {(t1 - t0) * 1e3:.6f} ms")
     
     ratio = heuristic_distance / optimal_distance
     print(f"\n📈 Ratio heuristique/optimal: {ratio:.2f}")